@@ -1,28 +1,128 @@
 import os
+import json
+import time
+import zipfile
+import threading
 import uvicorn
-from fastapi import FastAPI, APIRouter, UploadFile, File, HTTPException
+from typing import List
+from fastapi import FastAPI, APIRouter, UploadFile, File, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse, PlainTextResponse
+from starlette.background import BackgroundTask
+from starlette.concurrency import run_in_threadpool
 from pydantic import BaseModel
-from datetime import datetime
 
-from processor.ProcessorAksaraLontara import ProcessorAksaraLontara
+from processor.ProcessorAksaraLontara import ProcessorAksaraLontara, DETECTORS
+from utils.InferenceExecutor import InferenceExecutor, ExecutorBusyError
+from utils.PdfRasterizer import PdfRasterizer
+from utils.TranslationCache import TranslationCache
+from utils.OcrResultCache import OcrResultCache
+from utils.UploadStore import UploadStore, UploadTooLargeError, RequestSizeLimitMiddleware
+from utils.InferenceServer import InferenceClient
+from utils.JobQueue import JobStore, JobQueue, JobLeaseLost
+from utils.Metrics import (
+    REGISTRY, REQUEST_SECONDS, REQUESTS_IN_FLIGHT, stage, start_trace
+)
 
 # ===========================================
-# Ensure directories exist
+# Upload storage
 # ===========================================
 IMAGE_DIR = "dir_images"
 PDF_DIR = "dir_pdf"
+JOB_DIR = "dir_jobs"
+
+# Keep a copy of every upload on disk by default; per request ?persist=false
+PERSIST_UPLOADS = os.getenv("AKSARA_PERSIST_UPLOADS", "1").lower() not in ("0", "false", "no")
+
+image_store = UploadStore(
+    IMAGE_DIR, max_bytes=int(os.getenv("AKSARA_MAX_IMAGE_BYTES", str(20 * 1024 * 1024)))
+)
+pdf_store = UploadStore(
+    PDF_DIR, max_bytes=int(os.getenv("AKSARA_MAX_PDF_BYTES", str(100 * 1024 * 1024)))
+)
 
-os.makedirs(IMAGE_DIR, exist_ok=True)
-os.makedirs(PDF_DIR, exist_ok=True)
+# ===========================================
+# Initialize executor (blocking work runs off the event loop)
+# ===========================================
+executor = InferenceExecutor(
+    max_workers=int(os.getenv("AKSARA_THREAD_WORKERS", "4")),
+    max_queue=int(os.getenv("AKSARA_MAX_QUEUE", "16")),
+    pdf_processes=int(os.getenv("AKSARA_PDF_PROCESSES", "0")),
+    busy_status_code=int(os.getenv("AKSARA_BUSY_STATUS", "503")),
+)
+
+# Parallel PDF rasterization, only when a process pool is configured
+rasterizer = None
+if executor.process_pool is not None:
+    rasterizer = PdfRasterizer(
+        pool=executor.process_pool,
+        pages_per_task=int(os.getenv("AKSARA_PDF_PAGES_PER_TASK", "4")),
+        max_memory_bytes=int(os.getenv("AKSARA_PDF_MAX_MEMORY", str(512 * 1024 * 1024))),
+    )
+
+# ===========================================
+# Initialize caches
+# ===========================================
+translation_cache = TranslationCache(
+    max_items=int(os.getenv("AKSARA_TRANSLATION_CACHE_SIZE", "1024")),
+    ttl_seconds=float(os.getenv("AKSARA_TRANSLATION_CACHE_TTL", str(24 * 3600))),
+    db_path=os.getenv("AKSARA_TRANSLATION_CACHE_DB") or None,
+)
+ocr_cache = OcrResultCache(
+    max_bytes=int(os.getenv("AKSARA_OCR_CACHE_BYTES", str(64 * 1024 * 1024))),
+)
 
 # ===========================================
 # Initialize processor
 # ===========================================
+# With AKSARA_INFERENCE_SOCKET set, OCR and detection go to a shared
+# `python -m utils.InferenceServer` process; this worker loads no models
+inference_socket = os.getenv("AKSARA_INFERENCE_SOCKET")
+
 processor = ProcessorAksaraLontara(
-    ocr_model_path="dir_ocr_models/PP-OCRv5_server_rec_infer/buginese_ocr_model.onnx",
-    ocr_dict_path="dir_ocr_models/PP-OCRv5_server_rec_infer/lontara_chr.txt"
+    # May point at an optimized .ort or INT8 model from ocr.OcrModelOptimizer
+    ocr_model_path=os.getenv(
+        "AKSARA_OCR_MODEL_PATH",
+        "dir_ocr_models/PP-OCRv5_server_rec_infer/buginese_ocr_model.onnx"
+    ),
+    ocr_dict_path="dir_ocr_models/PP-OCRv5_server_rec_infer/lontara_chr.txt",
+    ocr_session_profile=os.getenv("AKSARA_ORT_PROFILE", "default"),
+    ocr_intra_op_threads=int(os.getenv("AKSARA_ORT_INTRA_THREADS", "0")) or None,
+    ocr_inter_op_threads=int(os.getenv("AKSARA_ORT_INTER_THREADS", "0")) or None,
+    # Recognize long lines as overlapping tiles instead of squeezing them
+    ocr_tile_long_lines=os.getenv("AKSARA_OCR_TILE_LONG_LINES", "0").lower() in ("1", "true", "yes"),
+    ocr_tile_overlap=int(os.getenv("AKSARA_OCR_TILE_OVERLAP", "48")),
+    # Longer lines are squeezed into this many tiles
+    ocr_max_tiles=int(os.getenv("AKSARA_OCR_MAX_TILES", "32")),
+    # Opt-in: pad crops to width buckets for larger batches; can change results
+    ocr_pad_to_buckets=os.getenv("AKSARA_OCR_PAD_TO_BUCKETS", "0").lower() in ("1", "true", "yes"),
+    yolo_model_path=os.getenv("YOLO_MODEL_PATH"),
+    det_model_dir=os.getenv("DET_MODEL_DIR"),
+    # Pages per detection forward pass; optional low-res pre-pass size
+    detect_batch_size=int(os.getenv("AKSARA_DETECT_BATCH_SIZE", "4")),
+    detect_prepass_size=int(os.getenv("AKSARA_DETECT_PREPASS_SIZE", "0")) or None,
+    # Images of a bulk upload recognized together
+    bulk_batch_size=int(os.getenv("AKSARA_BULK_BATCH_SIZE", "16")),
+    rasterizer=rasterizer,
+    translation_cache=translation_cache,
+    ocr_cache=ocr_cache,
+    min_line_confidence=float(os.getenv("AKSARA_MIN_LINE_CONFIDENCE", "0")),
+    # Cross-request micro-batching, enabled with a latency budget > 0
+    batch_max_latency_ms=float(os.getenv("AKSARA_BATCH_MAX_LATENCY_MS", "0")),
+    batch_max_size=int(os.getenv("AKSARA_BATCH_MAX_SIZE", "32")),
+    max_segment_tokens=int(os.getenv("AKSARA_TRANSLATION_SEGMENT_TOKENS", "1000")),
+    translation_concurrency=int(os.getenv("AKSARA_TRANSLATION_CONCURRENCY", "4")),
+    context_cache_ttl=int(os.getenv("AKSARA_CONTEXT_CACHE_TTL", "0")),
+    translator_backend=os.getenv("AKSARA_TRANSLATOR", "gemini"),
+    inference_client=InferenceClient(inference_socket) if inference_socket else None,
 )
+
+# Models load on first use. With warm-up on (default), they are loaded in
+# the background at startup and /health/ready reports 503 until done.
+WARMUP = os.getenv("AKSARA_WARMUP", "1").lower() not in ("0", "false", "no")
+STARTED_AT = time.time()
+warmup_state = {"timings": None, "error": None}
+
 # ===========================================
 # Main API
 # ===========================================
@@ -32,6 +132,22 @@ app = FastAPI(
     version="1.0.0"
 )
 
+# Oversized bodies get 413 before they are spooled: by Content-Length, or
+# as soon as a chunked body passes the limit. The per-file limits of the
+# upload stores still apply on top. Added before CORS, so CORS wraps it
+# and 413 responses carry the CORS headers browsers need to read them.
+MULTIPART_OVERHEAD = 64 * 1024
+app.add_middleware(
+    RequestSizeLimitMiddleware,
+    default_max_bytes=int(os.getenv("AKSARA_MAX_REQUEST_BYTES", str(10 * 1024 * 1024))),
+    limits={
+        "/lontara/translate/image": image_store.max_bytes + MULTIPART_OVERHEAD,
+        "/lontara/translate/pdf": pdf_store.max_bytes + MULTIPART_OVERHEAD,
+        "/lontara/jobs/pdf": pdf_store.max_bytes + MULTIPART_OVERHEAD,
+        "/lontara/translate/bulk": int(os.getenv("AKSARA_MAX_BULK_BYTES", str(500 * 1024 * 1024))),
+    },
+)
+
 # Enable CORS
 app.add_middleware(
     CORSMiddleware,
@@ -47,6 +163,83 @@ app.add_middleware(
 class TextRequest(BaseModel):
     text: str
 
+
+def _check_detector(detector: str):
+    if detector not in DETECTORS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown detector '{detector}', expected one of {list(DETECTORS)}."
+        )
+
+
+def _too_large(e: UploadTooLargeError) -> HTTPException:
+    return HTTPException(status_code=413, detail=str(e))
+
+
+def _busy(e: ExecutorBusyError) -> HTTPException:
+    return HTTPException(
+        status_code=e.status_code,
+        detail=str(e),
+        headers={"Retry-After": str(e.retry_after)}
+    )
+
+
+TIMINGS_QUERY = Query(False, description="Add a per-stage timing breakdown (seconds) to the response")
+
+
+def _with_timings(body: dict, trace: dict, started: float) -> dict:
+    if trace is not None:
+        body["timings"] = {**trace, "total": time.perf_counter() - started}
+    return body
+
+# ===========================================
+# Metrics
+# ===========================================
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    started = time.perf_counter()
+    REQUESTS_IN_FLIGHT.inc()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        REQUESTS_IN_FLIGHT.dec()
+        # Streaming responses are timed until their headers are sent
+        route = request.scope.get("route")
+        endpoint = route.path if route is not None else "unmatched"
+        REQUEST_SECONDS.observe(endpoint, str(status), value=time.perf_counter() - started)
+
+
+def _collect_runtime_metrics():
+    """Values read at scrape time from the executor, caches and batcher."""
+    metrics = [
+        ("aksara_executor_in_flight", "Jobs running on the inference executor.", "gauge",
+         [({}, executor.in_flight)]),
+        ("aksara_executor_queued", "Jobs waiting for an inference executor worker.", "gauge",
+         [({}, executor.queued)]),
+    ]
+
+    for name, cache in (("translation", translation_cache), ("ocr", ocr_cache)):
+        stats = cache.stats()
+        metrics.append((
+            f"aksara_{name}_cache_requests_total", f"{name} cache lookups by result.", "counter",
+            [({"result": "hit"}, stats["hits"]), ({"result": "miss"}, stats["misses"])]
+        ))
+
+    if processor.ocr_batcher is not None:
+        stats = processor.ocr_batcher.stats()
+        metrics.append((
+            "aksara_ocr_batcher_queued", "Crops waiting in the micro-batching scheduler.", "gauge",
+            [({}, stats["queued"])]
+        ))
+
+    return metrics
+
+
+REGISTRY.add_collector(_collect_runtime_metrics)
+
 # ===========================================
 # Router for Aksara Lontara
 # ===========================================
@@ -59,10 +252,14 @@ router_lontara = APIRouter(
 # 1. Translate Text (Lontara)
 # -------------------------------------------------------------
 @router_lontara.post("/translate/text")
-async def translate_text(payload: TextRequest):
+async def translate_text(payload: TextRequest, timings: bool = TIMINGS_QUERY):
+    started = time.perf_counter()
+    trace = start_trace() if timings else None
     try:
-        result = processor.generate_translation_from_text(payload.text)
-        return {"success": True, "result": result}
+        result = await executor.run(processor.generate_translation_from_text, payload.text)
+        return _with_timings({"success": True, "result": result}, trace, started)
+    except ExecutorBusyError as e:
+        raise _busy(e)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -71,20 +268,40 @@ async def translate_text(payload: TextRequest):
 # 2. Translate Image (Lontara)
 # -------------------------------------------------------------
 @router_lontara.post("/translate/image")
-async def translate_image(file: UploadFile = File(...)):
+async def translate_image(
+    file: UploadFile = File(...),
+    detector: str = Query("none", description="Line detection stage: none, yolo or paddle"),
+    persist: bool = Query(PERSIST_UPLOADS, description="Keep a copy of the upload on disk"),
+    timings: bool = TIMINGS_QUERY,
+):
+    _check_detector(detector)
+    started = time.perf_counter()
+    trace = start_trace() if timings else None
     try:
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        save_path = os.path.join(IMAGE_DIR, f"{timestamp}_{file.filename}")
-
-        # Save file
-        contents = await file.read()
-        with open(save_path, "wb") as f:
-            f.write(contents)
+        save_path = None
+        if persist:
+            with stage("store_upload"):
+                save_path = await run_in_threadpool(image_store.save, file.file, file.filename)
+            image_input = save_path
+        else:
+            # Decode straight from memory, nothing is written to disk
+            from PIL import Image
+            with stage("store_upload"):
+                buf = await run_in_threadpool(image_store.read, file.file)
+            image_input = Image.open(buf)
 
-        result = processor.generate_translation_from_image(save_path)
+        result = await executor.run(
+            processor.generate_translation_from_image, image_input, detector=detector
+        )
 
-        return {"success": True, "file_saved": save_path, "result": result}
+        return _with_timings(
+            {"success": True, "file_saved": save_path, "result": result}, trace, started
+        )
 
+    except UploadTooLargeError as e:
+        raise _too_large(e)
+    except ExecutorBusyError as e:
+        raise _busy(e)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -92,30 +309,467 @@ async def translate_image(file: UploadFile = File(...)):
 # -------------------------------------------------------------
 # 3. Translate PDF (Lontara)
 # -------------------------------------------------------------
+async def _store_pdf(file: UploadFile, persist: bool) -> str:
+    """Stream a PDF upload to disk: kept in PDF_DIR, or a temp file."""
+    if persist:
+        return await run_in_threadpool(pdf_store.save, file.file, file.filename)
+    return await run_in_threadpool(pdf_store.to_temp, file.file, file.filename)
+
+
 @router_lontara.post("/translate/pdf")
-async def translate_pdf(file: UploadFile = File(...)):
+async def translate_pdf(
+    file: UploadFile = File(...),
+    detector: str = Query("none", description="Line detection stage: none, yolo or paddle"),
+    persist: bool = Query(PERSIST_UPLOADS, description="Keep a copy of the upload on disk"),
+    timings: bool = TIMINGS_QUERY,
+):
+    _check_detector(detector)
+    started = time.perf_counter()
+    trace = start_trace() if timings else None
+    save_path = None
     try:
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        save_path = os.path.join(PDF_DIR, f"{timestamp}_{file.filename}")
+        with stage("store_upload"):
+            save_path = await _store_pdf(file, persist)
 
-        # Save file
-        contents = await file.read()
-        with open(save_path, "wb") as f:
-            f.write(contents)
+        result = await executor.run(
+            processor.generate_translation_from_pdf, save_path, detector=detector
+        )
 
-        result = processor.generate_translation_from_pdf(save_path)
+        return _with_timings(
+            {"success": True, "file_saved": save_path if persist else None, "result": result},
+            trace, started
+        )
 
-        return {"success": True, "file_saved": save_path, "result": result}
+    except UploadTooLargeError as e:
+        raise _too_large(e)
+    except ExecutorBusyError as e:
+        raise _busy(e)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+    finally:
+        if save_path and not persist:
+            os.remove(save_path)
+
+
+# -------------------------------------------------------------
+# 4. Translate PDF, streamed per page (Lontara)
+# -------------------------------------------------------------
+STREAM_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "sse": "text/event-stream",
+}
+
+
+def _check_format(fmt: str):
+    if fmt not in STREAM_FORMATS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown format '{fmt}', expected one of {list(STREAM_FORMATS)}."
+        )
+
+
+def _stream_chunk(event: str, data: dict, fmt: str) -> str:
+    payload = json.dumps(data, ensure_ascii=False)
+    if fmt == "sse":
+        return f"event: {event}\ndata: {payload}\n\n"
+    return payload + "\n"
+
+
+async def _stream_pdf_pages(save_path: str, detector: str, fmt: str, persist: bool, slot):
+    pages = processor.iter_translation_from_pdf(save_path, detector=detector)
+    done = object()
+    count = 0
+
+    try:
+        while True:
+            # Each page is pulled on the executor, so rendering/OCR/Gemini
+            # never block the event loop and pages are sent as they finish.
+            # The stream was admitted once up front (slot), so a started
+            # stream is never cut off by the busy check.
+            item = await slot.run(next, pages, done)
+            if item is done:
+                break
+            count += 1
+            yield _stream_chunk("page", item, fmt)
+
+        yield _stream_chunk("done", {"done": True, "pages": count}, fmt)
 
     except Exception as e:
+        yield _stream_chunk("error", {"error": str(e), "pages": count}, fmt)
+
+    finally:
+        try:
+            pages.close()
+        except ValueError:
+            # Still running on a worker thread (client went away); the
+            # generator is closed when that thread lets go of it
+            pass
+        slot.release()
+        if not persist:
+            os.remove(save_path)
+
+
+@router_lontara.post("/translate/pdf/stream")
+async def translate_pdf_stream(
+    file: UploadFile = File(...),
+    detector: str = Query("none", description="Line detection stage: none, yolo or paddle"),
+    format: str = Query("ndjson", description="Chunk format: ndjson or sse"),
+    persist: bool = Query(PERSIST_UPLOADS, description="Keep a copy of the upload on disk"),
+):
+    _check_detector(detector)
+    _check_format(format)
+
+    # Admission happens here, so an overloaded server answers 503/429
+    # before any page is sent
+    try:
+        slot = executor.reserve()
+    except ExecutorBusyError as e:
+        raise _busy(e)
+
+    try:
+        save_path = await _store_pdf(file, persist)
+    except UploadTooLargeError as e:
+        slot.release()
+        raise _too_large(e)
+    except Exception as e:
+        slot.release()
         raise HTTPException(status_code=500, detail=str(e))
 
+    headers = {"X-File-Saved": save_path} if persist else {}
+    return StreamingResponse(
+        _stream_pdf_pages(save_path, detector, format, persist, slot),
+        media_type=STREAM_FORMATS[format],
+        headers=headers,
+        # Also releases the slot if the stream never started
+        background=BackgroundTask(slot.release),
+    )
+
+
+# -------------------------------------------------------------
+# 5. Cache statistics
+# -------------------------------------------------------------
+@router_lontara.get("/cache/stats")
+def cache_stats():
+    return {
+        "translation": translation_cache.stats(),
+        "ocr": ocr_cache.stats(),
+        "translator": processor.translator.stats() if processor.translator_loaded else None,
+    }
+
+
+# -------------------------------------------------------------
+# 6. OCR batching statistics
+# -------------------------------------------------------------
+@router_lontara.get("/batch/stats")
+def batch_stats():
+    if processor.inference_client is not None:
+        return {
+            "enabled": True,
+            "server": processor.inference_client.socket_path,
+            **processor.inference_client.stats(),
+        }
+
+    # The scheduler itself is built on first use; report the configuration
+    batcher = processor.ocr_batcher
+    return {
+        "enabled": processor.batch_max_latency_ms > 0,
+        "scheduler": batcher.stats() if batcher is not None else None,
+        "buckets": processor.ocr.batch_throughput() if processor.ocr_loaded else {},
+    }
+
+
+# -------------------------------------------------------------
+# 7. Asynchronous PDF jobs
+# -------------------------------------------------------------
+# Jobs live in SQLite (AKSARA_JOB_DB) and run on their own worker threads,
+# page by page; every finished page is checkpointed, so a job interrupted
+# by a crash resumes after its last page. AKSARA_JOB_WORKERS=0 makes this
+# process accept jobs without running them (another process does).
+os.makedirs(JOB_DIR, exist_ok=True)
+job_store = JobStore(
+    os.getenv("AKSARA_JOB_DB", os.path.join(JOB_DIR, "jobs.sqlite3")),
+    lease_seconds=float(os.getenv("AKSARA_JOB_LEASE_SECONDS", "300")),
+)
+job_queue = None
+
+
+def _merge_pages(pages: list) -> dict:
+    return {
+        "pages": pages,
+        **{
+            field: "\n\n".join(p[field] for p in pages if p.get(field))
+            for field in ("aksara", "latin", "indonesia")
+        },
+    }
+
+
+def _run_pdf_job(job: dict, ctx) -> dict:
+    from utils.PdfRasterizer import page_sizes
+
+    params = job["params"]
+    path = params["file"]
+    try:
+        ctx.set_total(len(page_sizes(path)))
+        pages = processor.iter_translation_from_pdf(
+            path, detector=params["detector"], start_page=ctx.done_pages
+        )
+        try:
+            for page in pages:
+                ctx.checkpoint(page["page"], page)
+        finally:
+            pages.close()
+    except JobLeaseLost:
+        # Another worker took the job over and still reads the file
+        raise
+    except Exception:
+        # Failed or cancelled (JobCancelled): the job will not be resumed,
+        # so its private input copy can go
+        if not params["persist"]:
+            os.remove(path)
+        raise
+
+    if not params["persist"]:
+        os.remove(path)
+    return _merge_pages(job_store.pages(job["id"]))
+
+
+def _job_or_404(job_id: str) -> dict:
+    job = job_store.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job '{job_id}' not found.")
+    return job
+
+
+def _job_summary(job: dict) -> dict:
+    return {
+        key: job[key]
+        for key in ("id", "kind", "status", "pages_total", "pages_done", "error",
+                    "created_at", "updated_at")
+    }
+
+
+@router_lontara.post("/jobs/pdf", status_code=202)
+async def submit_pdf_job(
+    file: UploadFile = File(...),
+    detector: str = Query("none", description="Line detection stage: none, yolo or paddle"),
+    persist: bool = Query(PERSIST_UPLOADS, description="Keep a copy of the upload on disk"),
+):
+    _check_detector(detector)
+    try:
+        if persist:
+            path = await run_in_threadpool(pdf_store.save, file.file, file.filename)
+        else:
+            # One private copy per job, removed when the job finishes
+            path = await run_in_threadpool(pdf_store.to_temp, file.file, file.filename, JOB_DIR)
+    except UploadTooLargeError as e:
+        raise _too_large(e)
+
+    try:
+        job_id = job_queue.submit("pdf", {"file": path, "detector": detector, "persist": persist})
+    except Exception as e:
+        # No job owns the private copy, so nothing else would remove it
+        if not persist:
+            os.remove(path)
+        raise HTTPException(status_code=500, detail=str(e))
+
+    return {"success": True, "job_id": job_id, "status": "queued"}
+
+
+@router_lontara.get("/jobs/{job_id}")
+def job_status(job_id: str):
+    return {"success": True, "job": _job_summary(_job_or_404(job_id))}
+
+
+@router_lontara.get("/jobs/{job_id}/result")
+def job_result(job_id: str):
+    """Final result once done; until then the pages finished so far."""
+    job = _job_or_404(job_id)
+    if job["status"] == "done":
+        result = job["result"]
+    else:
+        result = _merge_pages(job_store.pages(job_id))
+
+    return {
+        "success": True,
+        "status": job["status"],
+        "partial": job["status"] != "done",
+        "error": job["error"],
+        "result": result,
+    }
+
+
+@router_lontara.post("/jobs/{job_id}/cancel")
+def cancel_job(job_id: str):
+    job = _job_or_404(job_id)
+    previous = job_store.cancel(job_id)
+
+    # A job cancelled before any worker took it never runs its cleanup;
+    # a running one removes its file itself at the next checkpoint
+    if previous == "queued" and not job["params"]["persist"]:
+        if os.path.exists(job["params"]["file"]):
+            os.remove(job["params"]["file"])
+
+    return {
+        "success": True,
+        "cancelled": previous is not None,
+        "status": job_store.status(job_id),
+    }
+
+
+# -------------------------------------------------------------
+# 8. Bulk images and ZIP archives, streamed per file
+# -------------------------------------------------------------
+# Uploads are decoded one file at a time as the processor asks for them;
+# images are OCR'd in cross-file batches and identical texts translated
+# once. Nothing is written to disk.
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".tif", ".tiff", ".bmp", ".webp")
+BULK_MAX_FILES = int(os.getenv("AKSARA_BULK_MAX_FILES", "1000"))
+
+
+def _open_image(fileobj):
+    """Size-limited read and lazy decode; errors are returned, not raised."""
+    from PIL import Image
+    try:
+        return Image.open(image_store.read(fileobj))
+    except Exception as e:
+        return e
+
+
+def _open_member(archive: zipfile.ZipFile, info: zipfile.ZipInfo):
+    if not info.filename.lower().endswith(IMAGE_EXTENSIONS):
+        return ValueError(f"Unsupported file type: {info.filename}")
+    # Checked against the declared size first, then while decompressing
+    if info.file_size > image_store.max_bytes:
+        return UploadTooLargeError(image_store.max_bytes)
+    try:
+        with archive.open(info) as member:
+            return _open_image(member)
+    except Exception as e:
+        return e
+
+
+def _iter_upload(upload: UploadFile):
+    if not zipfile.is_zipfile(upload.file):
+        upload.file.seek(0)
+        yield upload.filename, _open_image(upload.file)
+        return
+
+    # Members are decompressed one at a time straight from the upload
+    archive = zipfile.ZipFile(upload.file)
+    for info in archive.infolist():
+        name = info.filename
+        if info.is_dir() or name.startswith("__MACOSX/") or os.path.basename(name).startswith("."):
+            continue
+        yield f"{upload.filename}/{name}", _open_member(archive, info)
+
+
+def _iter_bulk_images(files: List[UploadFile]):
+    """
+    Yield (name, PIL image or Exception) for every uploaded image and
+    every image member of uploaded ZIP archives, in upload order.
+    """
+    count = 0
+    for upload in files:
+        for name, image in _iter_upload(upload):
+            count += 1
+            if count > BULK_MAX_FILES:
+                raise ValueError(f"Bulk upload exceeds the limit of {BULK_MAX_FILES} files.")
+            yield name, image
+
+
+async def _stream_bulk(files: List[UploadFile], detector: str, fmt: str, slot):
+    results = processor.iter_translation_from_images(_iter_bulk_images(files), detector=detector)
+    done = object()
+    count = failed = 0
+
+    try:
+        while True:
+            # Decoding, OCR and translation all run on the executor (admitted
+            # once, see translate_bulk); a batch of files is processed on the
+            # first pull and then sent one by one
+            item = await slot.run(next, results, done)
+            if item is done:
+                break
+            count += 1
+            failed += not item["success"]
+            yield _stream_chunk("file", item, fmt)
+
+        yield _stream_chunk("done", {"done": True, "files": count, "failed": failed}, fmt)
+
+    except Exception as e:
+        yield _stream_chunk("error", {"error": str(e), "files": count}, fmt)
+
+    finally:
+        try:
+            results.close()
+        except ValueError:
+            # Still running on a worker thread (client went away)
+            pass
+        slot.release()
+
+
+@router_lontara.post("/translate/bulk")
+async def translate_bulk(
+    files: List[UploadFile] = File(..., description="Images and/or ZIP archives of images"),
+    detector: str = Query("none", description="Line detection stage: none, yolo or paddle"),
+    format: str = Query("ndjson", description="Chunk format: ndjson or sse"),
+):
+    _check_detector(detector)
+    _check_format(format)
+
+    try:
+        slot = executor.reserve()
+    except ExecutorBusyError as e:
+        raise _busy(e)
+
+    return StreamingResponse(
+        _stream_bulk(files, detector, format, slot),
+        media_type=STREAM_FORMATS[format],
+        background=BackgroundTask(slot.release),
+    )
+
 
 # ===========================================
 # Register Routers
 # ===========================================
 app.include_router(router_lontara)
 
+
+def _warmup():
+    try:
+        warmup_state["timings"] = processor.warmup()
+    except Exception as e:
+        warmup_state["error"] = str(e)
+
+
+@app.on_event("startup")
+def start_warmup():
+    if WARMUP:
+        threading.Thread(target=_warmup, name="aksara-warmup", daemon=True).start()
+    else:
+        processor.ready = True
+
+
+@app.on_event("startup")
+def start_job_workers():
+    global job_queue
+    job_queue = JobQueue(
+        job_store,
+        handlers={"pdf": _run_pdf_job},
+        workers=int(os.getenv("AKSARA_JOB_WORKERS", "2")),
+    )
+
+
+@app.on_event("shutdown")
+def shutdown_executor():
+    executor.shutdown()
+    if job_queue is not None:
+        job_queue.shutdown()
+    processor.translation_scheduler.shutdown()
+    if processor.ocr_batcher is not None:
+        processor.ocr_batcher.close()
+
 # ===========================================
 # Root endpoint
 # ===========================================
@@ -130,6 +784,30 @@ def home():
     }
 
 
+# ===========================================
+# Prometheus metrics
+# ===========================================
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
+
+
+# ===========================================
+# Health endpoints
+# ===========================================
+@app.get("/health/live")
+def health_live():
+    return {"status": "alive", "uptime_seconds": time.time() - STARTED_AT}
+
+
+@app.get("/health/ready")
+def health_ready():
+    if not processor.ready:
+        detail = warmup_state["error"] or "Warming up."
+        raise HTTPException(status_code=503, detail=detail, headers={"Retry-After": "1"})
+    return {"status": "ready", "warmup": warmup_state["timings"]}
+
+
 # ===========================================
 # Run App
 # ===========================================
@@ -0,0 +1,120 @@
+"""
+Line grouping / box merging benchmark on dense pages.
+
+Compares the previous pure-Python path (sort-and-loop line grouping, then
+the per-line x-gap merge loop) with det.BoxGrouping on synthetic pages of
+character boxes, and checks that both produce the same lines. The NumPy
+path gets the boxes as an [N, 4] array, as YOLO returns them.
+
+Usage:
+    python -m bench.bench_box_grouping [--boxes 5000 20000] [--gap 25]
+"""
+import os
+import sys
+import json
+import time
+import argparse
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from det.BoxGrouping import reading_order_lines
+
+
+def make_page(n_boxes: int, seed: int = 0) -> list:
+    """Character boxes on jittered text lines, in random order."""
+    rng = np.random.default_rng(seed)
+    per_line = 100
+    boxes = []
+    for line in range(int(np.ceil(n_boxes / per_line))):
+        top = 40 + line * 36
+        x = 20
+        for _ in range(per_line):
+            w = int(rng.integers(8, 22))
+            h = int(rng.integers(18, 26))
+            dy = int(rng.integers(-3, 4))
+            boxes.append([x, top + dy, x + w, top + dy + h])
+            x += w + int(rng.integers(2, 40))
+    boxes = boxes[:n_boxes]
+    rng.shuffle(boxes)
+    return boxes
+
+
+def legacy_lines(boxes, max_gap: float) -> list:
+    boxes = sorted(boxes, key=lambda b: (b[1] + b[3]) / 2)
+    lines = []
+    line_bottom = None
+    for b in boxes:
+        center_y = (b[1] + b[3]) / 2
+        if line_bottom is None or center_y > line_bottom:
+            lines.append([])
+            line_bottom = b[3]
+        else:
+            line_bottom = max(line_bottom, b[3])
+        lines[-1].append(b)
+
+    result = []
+    for line in lines:
+        line = sorted(line, key=lambda b: b[0])
+        if max_gap <= 0:
+            result.append(line)
+            continue
+
+        merged = []
+        current = line[0]
+        for b in line[1:]:
+            if b[0] - current[2] < max_gap:
+                current = [
+                    min(current[0], b[0]),
+                    min(current[1], b[1]),
+                    max(current[2], b[2]),
+                    max(current[3], b[3]),
+                ]
+            else:
+                merged.append(current)
+                current = b
+        merged.append(current)
+        result.append(merged)
+    return result
+
+
+def timed(fn, *args, repeat: int = 5):
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn(*args)
+        times.append(time.perf_counter() - t0)
+    return out, min(times) * 1000.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--boxes", type=int, nargs="+", default=[1000, 5000, 20000])
+    parser.add_argument("--gap", type=float, default=25)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args()
+
+    results = {}
+    for n in args.boxes:
+        boxes = make_page(n)
+        old, old_ms = timed(legacy_lines, boxes, args.gap, repeat=args.repeat)
+        new, new_ms = timed(reading_order_lines, np.array(boxes), args.gap, repeat=args.repeat)
+        results[n] = {
+            "lines": len(new),
+            "merged_boxes": sum(len(line) for line in new),
+            "legacy_ms": old_ms,
+            "numpy_ms": new_ms,
+            "speedup": old_ms / new_ms if new_ms else 0.0,
+            "identical": old == new,
+        }
+
+    print(json.dumps(results, indent=2))
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+"""
+Recognizer accuracy-vs-latency report.
+
+Runs every model variant (e.g. the original, an optimized .ort and an INT8
+model from ocr.OcrModelOptimizer) over the same line crops and reports:
+- line accuracy and character error rate against the labels
+- agreement with the first model (the reference), so a variant can be
+  judged even without labels
+- load time, per-line latency and batched throughput, model size
+- batched results against exact-width single-crop recognition, and both
+  against the labels; with --pad-to-buckets this shows what bucket
+  padding costs
+
+The test set is a PaddleOCR recognition label file: one
+`image_path<TAB>text` per line, paths relative to the label file.
+Without --labels, random crops are generated and only agreement and
+latency are reported.
+
+Usage:
+    python -m bench.bench_ocr_model --models model.onnx model.opt.ort model.int8.onnx \\
+        [--labels test/rec_gt.txt] [--profile latency] [--batch-size 16] [--pad-to-buckets]
+"""
+import os
+import sys
+import json
+import time
+import argparse
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ocr.OcrAksaraLontara import OcrAksaraLontara, SESSION_PROFILES
+
+DEFAULT_DICT = "dir_ocr_models/PP-OCRv5_server_rec_infer/lontara_chr.txt"
+
+
+def load_test_set(label_path: str):
+    """(crops, texts) from a PaddleOCR recognition label file."""
+    root = os.path.dirname(os.path.abspath(label_path))
+    crops, texts = [], []
+    with open(label_path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.rstrip("\n")
+            if not line:
+                continue
+            path, text = line.split("\t", 1)
+            crops.append(OcrAksaraLontara.load_image(os.path.join(root, path)))
+            texts.append(text)
+    return crops, texts
+
+
+def random_crops(n: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    crops = []
+    for _ in range(n):
+        width = int(rng.integers(60, 900))
+        crop = np.full((48, width, 3), 255, dtype=np.uint8)
+        for x in range(8, width - 16, int(rng.integers(14, 30))):
+            crop[12:36, x:x + int(rng.integers(3, 10))] = 0
+        crops.append(crop)
+    return crops, None
+
+
+def edit_distance(a: str, b: str) -> int:
+    prev = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        cur = [i]
+        for j, cb in enumerate(b, 1):
+            cur.append(min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + (ca != cb)))
+        prev = cur
+    return prev[-1]
+
+
+def score(predictions, texts) -> dict:
+    errors = sum(edit_distance(p, t) for p, t in zip(predictions, texts))
+    chars = max(1, sum(len(t) for t in texts))
+    return {
+        "line_accuracy": float(np.mean([p == t for p, t in zip(predictions, texts)])),
+        "cer": errors / chars,
+    }
+
+
+def bench_model(model_path, dict_path, crops, profile, batch_size, pad_to_buckets=False) -> tuple:
+    t0 = time.perf_counter()
+    ocr = OcrAksaraLontara(
+        model_path, dict_path, session_profile=profile, pad_to_buckets=pad_to_buckets
+    )
+    load_s = time.perf_counter() - t0
+
+    # Warm the session, then time lines one at a time
+    ocr.ocr_aksara_batch(crops[:1])
+    line_ms = []
+    for crop in crops:
+        t0 = time.perf_counter()
+        ocr.ocr_aksara_batch([crop])
+        line_ms.append((time.perf_counter() - t0) * 1000.0)
+
+    t0 = time.perf_counter()
+    predictions = []
+    for i in range(0, len(crops), batch_size):
+        predictions.extend(ocr.ocr_aksara_batch(crops[i:i + batch_size]))
+    batch_s = time.perf_counter() - t0
+
+    exact = [ocr.ocr_aksara_from_image(crop) for crop in crops]
+
+    line_ms = np.array(line_ms)
+    return predictions, exact, {
+        "size_mb": os.path.getsize(model_path) / 1e6,
+        "load_ms": load_s * 1000.0,
+        "line_mean_ms": float(line_ms.mean()),
+        "line_p50_ms": float(np.percentile(line_ms, 50)),
+        "line_p95_ms": float(np.percentile(line_ms, 95)),
+        "batched_lines_per_s": len(crops) / batch_s if batch_s else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--models", nargs="+", required=True, help="first one is the reference")
+    parser.add_argument("--dict", default=DEFAULT_DICT)
+    parser.add_argument("--labels", help="PaddleOCR label file (default: random crops)")
+    parser.add_argument("--lines", type=int, default=200, help="random crops without --labels")
+    parser.add_argument("--profile", default="default", choices=list(SESSION_PROFILES))
+    parser.add_argument("--batch-size", type=int, default=16)
+    parser.add_argument("--pad-to-buckets", action="store_true",
+                        help="batch with bucket padding and report how it changes results")
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args()
+
+    if args.labels:
+        crops, texts = load_test_set(args.labels)
+    else:
+        crops, texts = random_crops(args.lines)
+
+    results = {
+        "lines": len(crops), "profile": args.profile,
+        "pad_to_buckets": args.pad_to_buckets, "models": {},
+    }
+    reference = None
+    for model_path in args.models:
+        predictions, exact, report = bench_model(
+            model_path, args.dict, crops, args.profile, args.batch_size, args.pad_to_buckets
+        )
+        if texts is not None:
+            report.update(score(predictions, texts))
+            report["exact_width"] = score(exact, texts)
+        # How often batching changes the text of a crop (only padding should)
+        report["batched_vs_exact"] = score(predictions, exact)
+        if reference is None:
+            reference = predictions
+        report["agreement"] = score(predictions, reference)
+        results["models"][model_path] = report
+
+    print(json.dumps(results, indent=2))
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
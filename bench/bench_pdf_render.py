@@ -0,0 +1,110 @@
+"""
+PDF page -> OCR input benchmark.
+
+Compares the old per-page path (render -> PIL -> PNG BytesIO ->
+Image.open -> np.array) with the direct pdfium bitmap -> NumPy view.
+
+Usage:
+    python -m bench.bench_pdf_render [--pdf file.pdf] [--pages 10] [--scale 2]
+"""
+import io
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+
+import numpy as np
+import pypdfium2 as pdfium
+from PIL import Image, ImageDraw
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.PdfRasterizer import render_bitmap
+
+
+def make_pdf(path: str, n_pages: int):
+    """Write a simple multi-page PDF with dark text-like bars."""
+    pages = []
+    for i in range(n_pages):
+        img = Image.new("RGB", (1240, 1754), "white")
+        draw = ImageDraw.Draw(img)
+        for row in range(30):
+            y = 80 + row * 54
+            draw.rectangle([80, y, 1160 - (row * 37 + i * 11) % 400, y + 28], fill="black")
+        pages.append(img)
+    pages[0].save(path, save_all=True, append_images=pages[1:])
+
+
+def via_png(page, scale):
+    pil = page.render(scale=scale).to_pil()
+    buf = io.BytesIO()
+    pil.save(buf, format="PNG")
+    buf.seek(0)
+    return np.array(Image.open(buf).convert("RGB"))
+
+
+def via_numpy(page, scale):
+    bitmap = render_bitmap(page, scale)
+    arr = bitmap.to_numpy()
+    # Touch the data so both paths end with pixels in hand
+    arr[0, 0, 0]
+    return arr, bitmap
+
+
+def bench(pdf_path: str, scale: float, repeat: int) -> dict:
+    pdf = pdfium.PdfDocument(pdf_path)
+    n_pages = len(pdf)
+    results = {}
+
+    for name, fn in (("png_roundtrip", via_png), ("numpy_view", via_numpy)):
+        times = []
+        for _ in range(repeat):
+            for i in range(n_pages):
+                page = pdf[i]
+                t0 = time.perf_counter()
+                fn(page, scale)
+                times.append(time.perf_counter() - t0)
+                page.close()
+
+        times = np.array(times) * 1000.0
+        results[name] = {
+            "pages": len(times),
+            "mean_ms": float(times.mean()),
+            "p50_ms": float(np.percentile(times, 50)),
+            "p95_ms": float(np.percentile(times, 95)),
+        }
+
+    pdf.close()
+    results["saving_ms_per_page"] = (
+        results["png_roundtrip"]["mean_ms"] - results["numpy_view"]["mean_ms"]
+    )
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--pdf", help="PDF to render (default: generated)")
+    parser.add_argument("--pages", type=int, default=10, help="pages in the generated PDF")
+    parser.add_argument("--scale", type=float, default=2)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        pdf_path = args.pdf
+        if not pdf_path:
+            pdf_path = os.path.join(tmp, "bench.pdf")
+            make_pdf(pdf_path, args.pages)
+
+        results = bench(pdf_path, args.scale, args.repeat)
+
+    print(json.dumps(results, indent=2))
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
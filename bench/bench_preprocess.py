@@ -0,0 +1,154 @@
+"""
+Recognizer input preprocessing benchmark.
+
+Compares the previous batch fill (a fresh zeroed batch per session.run,
+filled by astype / divide / subtract / divide / transpose per crop) with
+PreprocessBuffers (reused per-bucket batches, one lookup-table pass per
+crop) on synthetic lines, and checks that both give identical inputs.
+Reports time per crop and, via tracemalloc, the bytes and blocks
+allocated while filling each batch.
+
+Usage:
+    python -m bench.bench_preprocess [--lines 512] [--batch-size 1 8 32]
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import tracemalloc
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import cv2
+from bench.synthetic import DEFAULT_DICT, load_charset, random_lines
+from ocr.OcrAksaraLontara import PreprocessBuffers
+
+IMG_HEIGHT = 48
+WIDTH_BUCKETS = (80, 160, 240, 320)
+
+
+def resize(img, max_width: int = 320):
+    h, w, _ = img.shape
+    new_w = min(max(1, int(IMG_HEIGHT * w / float(h))), max_width)
+    return cv2.resize(img, (new_w, IMG_HEIGHT))
+
+
+def bucket_width(width: int) -> int:
+    return next((b for b in WIDTH_BUCKETS if width <= b), WIDTH_BUCKETS[-1])
+
+
+def legacy_batch(crops, bucket: int):
+    batch = np.zeros((len(crops), 3, IMG_HEIGHT, bucket), dtype=np.float32)
+    for row, img in enumerate(crops):
+        norm = img.astype("float32") / 255.0
+        norm = (norm - 0.5) / 0.5
+        batch[row, :, :, :img.shape[1]] = norm.transpose(2, 0, 1)
+    return batch
+
+
+def buffered_batch(buffers, crops, bucket: int):
+    batch = buffers.batch(len(crops), bucket)
+    for row, img in enumerate(crops):
+        buffers.fill(batch, row, img)
+    return batch
+
+
+def make_batches(crops, batch_size: int) -> list:
+    """(bucket, crops) per session.run, grouped by bucket as the recognizer does."""
+    groups = {}
+    for img in sorted(crops, key=lambda c: c.shape[1]):
+        groups.setdefault(bucket_width(img.shape[1]), []).append(img)
+    return [
+        (bucket, group[start:start + batch_size])
+        for bucket, group in groups.items()
+        for start in range(0, len(group), batch_size)
+    ]
+
+
+def run(fill, batches, repeat: int) -> float:
+    """Best-of-repeat seconds for filling every batch once."""
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for bucket, crops in batches:
+            fill(crops, bucket)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def allocations(fill, batches) -> dict:
+    """
+    Per batch: bytes and blocks still allocated after the fill (for the
+    previous path, the batch itself) and the peak, temporaries included.
+    """
+    tracemalloc.start()
+    total_bytes = total_blocks = 0
+    peak = 0
+    for bucket, crops in batches:
+        before = tracemalloc.take_snapshot()
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+        batch = fill(crops, bucket)
+        peak = max(peak, tracemalloc.get_traced_memory()[1] - base)
+        diff = tracemalloc.take_snapshot().compare_to(before, "filename")
+        total_bytes += sum(d.size_diff for d in diff if d.size_diff > 0)
+        total_blocks += sum(d.count_diff for d in diff if d.count_diff > 0)
+        del batch
+    tracemalloc.stop()
+
+    return {
+        "new_kb_per_batch": total_bytes / len(batches) / 1024,
+        "blocks_per_batch": total_blocks / len(batches),
+        "peak_kb": peak / 1024,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--dict", default=DEFAULT_DICT)
+    parser.add_argument("--lines", type=int, default=512)
+    parser.add_argument("--batch-size", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args()
+
+    lines = random_lines(args.lines, load_charset(args.dict), seed=args.seed)
+    crops = [resize(img) for img, _ in lines]
+
+    results = {}
+    for batch_size in args.batch_size:
+        batches = make_batches(crops, batch_size)
+        buffers = PreprocessBuffers(IMG_HEIGHT, batch_size)
+
+        def buffered(c, b):
+            return buffered_batch(buffers, c, b)
+
+        identical = all(
+            np.array_equal(legacy_batch(c, b), buffered(c, b)) for b, c in batches
+        )
+        buffered(*reversed(batches[-1]))    # buffers warm, as in a running server
+
+        legacy_s = run(legacy_batch, batches, args.repeat)
+        buffered_s = run(buffered, batches, args.repeat)
+        results[batch_size] = {
+            "identical": identical,
+            "legacy_us_per_crop": legacy_s / len(crops) * 1e6,
+            "buffered_us_per_crop": buffered_s / len(crops) * 1e6,
+            "speedup": legacy_s / buffered_s if buffered_s else 0.0,
+            "legacy_alloc": allocations(legacy_batch, batches),
+            "buffered_alloc": allocations(buffered, batches),
+            "buffer_kb": buffers.nbytes() / 1024,
+        }
+
+    print(json.dumps(results, indent=2))
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
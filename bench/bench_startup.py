@@ -0,0 +1,86 @@
+"""
+Startup benchmark: import time, time-to-ready and time-to-first-response.
+
+Every run starts a fresh interpreter, imports app.py, starts the app
+(which triggers warm-up unless AKSARA_WARMUP=0) and times:
+- import_s: `import app`
+- ready_s: from import start until /health/ready returns 200
+- first_response_s: the first /lontara/translate/text call after ready
+
+Uses the offline translator by default so no API key is needed; the OCR
+model must exist at the path configured in app.py for warm-up to pass.
+
+Usage:
+    python -m bench.bench_startup [--runs 3] [--warmup 1] [--translator local]
+"""
+import os
+import sys
+import json
+import argparse
+import subprocess
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CHILD = r"""
+import json, time
+t0 = time.perf_counter()
+import app
+t_import = time.perf_counter() - t0
+
+from fastapi.testclient import TestClient
+with TestClient(app.app) as client:
+    while True:
+        r = client.get("/health/ready")
+        if r.status_code == 200 or app.warmup_state["error"]:
+            break
+        time.sleep(0.01)
+    t_ready = time.perf_counter() - t0
+
+    t1 = time.perf_counter()
+    r = client.post("/lontara/translate/text", json={"text": "ᨀᨔᨊ"})
+    t_first = time.perf_counter() - t1
+
+print(json.dumps({
+    "import_s": t_import,
+    "ready_s": t_ready,
+    "first_response_s": t_first,
+    "first_status": r.status_code,
+    "warmup_error": app.warmup_state["error"],
+}))
+"""
+
+
+def run_once(env: dict) -> dict:
+    out = subprocess.run(
+        [sys.executable, "-c", CHILD],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=True
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--warmup", default="1", help="AKSARA_WARMUP for the child process")
+    parser.add_argument("--translator", default="local", help="AKSARA_TRANSLATOR for the child process")
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args()
+
+    env = dict(os.environ, AKSARA_WARMUP=args.warmup, AKSARA_TRANSLATOR=args.translator)
+    runs = [run_once(env) for _ in range(args.runs)]
+
+    results = {"runs": runs}
+    for key in ("import_s", "ready_s", "first_response_s"):
+        values = np.array([r[key] for r in runs])
+        results[key] = {"mean": float(values.mean()), "min": float(values.min())}
+
+    print(json.dumps(results, indent=2))
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+"""
+Offline benchmark suite for the OCR and PDF pipeline.
+
+Needs no network: lines and PDFs are synthetic (bench/synthetic.py) and
+translation uses the offline "local" backend. Measures:
+- stages: preprocess, ONNX inference and CTC decode, per line
+- ocr: single-line recognition latency/throughput at each concurrency level
+- pdf: end-to-end PDF translation latency/throughput at each concurrency level
+
+Results (with git commit and environment) are written as JSON; pass
+--compare to print the change of every timing against an earlier run.
+
+Usage:
+    python -m bench.bench_suite [--concurrency 1 4 8] [--json out.json] [--compare base.json]
+"""
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+import tempfile
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from bench.synthetic import DEFAULT_DICT, load_charset, random_lines, make_pdf
+from ocr.OcrAksaraLontara import OcrAksaraLontara
+from processor.ProcessorAksaraLontara import ProcessorAksaraLontara
+
+DEFAULT_MODEL = "dir_ocr_models/PP-OCRv5_server_rec_infer/buginese_ocr_model.onnx"
+
+
+def summarize(seconds, count_per_item: int = 1, wall: float = None) -> dict:
+    ms = np.asarray(seconds) * 1000.0
+    out = {
+        "n": int(ms.size),
+        "mean_ms": float(ms.mean()),
+        "p50_ms": float(np.percentile(ms, 50)),
+        "p95_ms": float(np.percentile(ms, 95)),
+        "p99_ms": float(np.percentile(ms, 99)),
+    }
+    if wall:
+        out["per_s"] = ms.size * count_per_item / wall
+    return out
+
+
+def bench_stages(ocr, lines, batch_size: int) -> dict:
+    """Time the three recognizer stages separately, batch by batch."""
+    pre, infer, decode = [], [], []
+    buffers = ocr.preprocess_buffers()
+    for start in range(0, len(lines), batch_size):
+        chunk = [img for img, _ in lines[start:start + batch_size]]
+
+        t0 = time.perf_counter()
+        resized = [ocr.resize(ocr.load_image(img)) for img in chunk]
+        width = ocr.bucket_width(max(img.shape[1] for img in resized))
+        batch = buffers.batch(len(chunk), width)
+        for row, img in enumerate(resized):
+            buffers.fill(batch, row, img)
+        t1 = time.perf_counter()
+        preds = ocr.session.run([ocr.output_name], {ocr.input_name: batch})[0]
+        t2 = time.perf_counter()
+        ocr.ctc_decode_batch(preds)
+        t3 = time.perf_counter()
+
+        # Per line, so batch sizes are comparable
+        pre.append((t1 - t0) / len(chunk))
+        infer.append((t2 - t1) / len(chunk))
+        decode.append((t3 - t2) / len(chunk))
+
+    return {
+        "batch_size": batch_size,
+        "preprocess": summarize(pre),
+        "inference": summarize(infer),
+        "decode": summarize(decode),
+    }
+
+
+def run_concurrent(fn, items, concurrency: int):
+    """Call fn(item) for every item on `concurrency` threads; (latencies, wall)."""
+    def timed(item):
+        t0 = time.perf_counter()
+        fn(item)
+        return time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        latencies = list(pool.map(timed, items))
+    return latencies, time.perf_counter() - t0
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results: dict, baseline: dict, path: str = "") -> list:
+    """Relative change of every *_ms value present in both runs."""
+    rows = []
+    for key, value in results.items():
+        if key not in baseline:
+            continue
+        name = f"{path}.{key}" if path else key
+        if isinstance(value, dict) and isinstance(baseline[key], dict):
+            rows.extend(compare(value, baseline[key], name))
+        elif key.endswith("_ms") and baseline[key]:
+            rows.append((name, baseline[key], value, (value - baseline[key]) / baseline[key]))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--model", default=DEFAULT_MODEL)
+    parser.add_argument("--dict", default=DEFAULT_DICT)
+    parser.add_argument("--font", help="TTF with Buginese glyphs (default: stand-in glyphs)")
+    parser.add_argument("--profile", default="default", help="ORT session profile")
+    parser.add_argument("--lines", type=int, default=256)
+    parser.add_argument("--batch-size", type=int, default=16)
+    parser.add_argument("--pdfs", type=int, default=8, help="documents per concurrency level")
+    parser.add_argument("--pages", type=int, default=4, help="pages per document")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="write results to this file")
+    parser.add_argument("--compare", help="earlier results file to compare against")
+    args = parser.parse_args()
+
+    import onnxruntime as ort
+
+    charset = load_charset(args.dict)
+    lines = random_lines(args.lines, charset, seed=args.seed, font_path=args.font)
+
+    results = {
+        "meta": {
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "onnxruntime": ort.__version__,
+            "cpu_count": os.cpu_count(),
+            "args": vars(args),
+        },
+    }
+
+    ocr = OcrAksaraLontara(args.model, args.dict, session_profile=args.profile)
+    ocr.ocr_aksara_batch([img for img, _ in lines[:4]])    # warm the session
+    results["stages"] = bench_stages(ocr, lines, args.batch_size)
+
+    results["ocr"] = {}
+    for c in args.concurrency:
+        latencies, wall = run_concurrent(lambda line: ocr.ocr_aksara_batch([line[0]]), lines, c)
+        results["ocr"][str(c)] = summarize(latencies, wall=wall)
+
+    processor = ProcessorAksaraLontara(
+        ocr_model_path=args.model,
+        ocr_dict_path=args.dict,
+        ocr_session_profile=args.profile,
+        translator_backend="local",
+    )
+    processor.warmup()
+
+    results["pdf"] = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        pdfs = []
+        for i in range(args.pdfs):
+            path = os.path.join(tmp, f"doc{i}.pdf")
+            make_pdf(path, args.pages, charset, seed=args.seed + i, font_path=args.font)
+            pdfs.append(path)
+
+        for c in args.concurrency:
+            latencies, wall = run_concurrent(processor.generate_translation_from_pdf, pdfs, c)
+            report = summarize(latencies, wall=wall)
+            report["pages_per_s"] = len(pdfs) * args.pages / wall
+            results["pdf"][str(c)] = report
+
+    print(json.dumps(results, indent=2, ensure_ascii=False))
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        print(f"\nvs {args.compare} (commit {baseline.get('meta', {}).get('commit')}):")
+        for name, old, new, change in compare(results, baseline):
+            print(f"{name:40s} {old:10.3f} -> {new:10.3f} ms  {change:+.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Synthetic Lontara data for the offline benchmarks.
+
+Lines are built from the recognizer's own character dictionary
+(lontara_chr.txt). With a font that covers the Buginese block (e.g. Noto
+Sans Buginese) the text is rendered for real; without one, every character
+is drawn as a fixed stroke pattern derived from its code point, which keeps
+image sizes and ink density realistic for timing. Everything is seeded, so
+runs are reproducible.
+"""
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont
+
+DEFAULT_DICT = "dir_ocr_models/PP-OCRv5_server_rec_infer/lontara_chr.txt"
+
+
+def load_charset(dict_path: str = DEFAULT_DICT) -> list:
+    with open(dict_path, "r", encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip()]
+
+
+def _glyph(draw, char: str, x: int, height: int) -> int:
+    """Draw a stand-in glyph for `char` at x; returns its advance width."""
+    rng = np.random.default_rng(ord(char[0]))
+    width = int(height * rng.uniform(0.45, 0.75))
+    top, bottom = int(height * 0.2), int(height * 0.8)
+    for _ in range(int(rng.integers(2, 5))):
+        x1, x2 = sorted(rng.integers(x, x + width, 2).tolist())
+        y1, y2 = sorted(rng.integers(top, bottom, 2).tolist())
+        draw.line([x1, y1, x2, y2], fill=0, width=max(2, height // 16))
+    return width + height // 8
+
+
+def render_line(text: str, height: int = 48, font_path: str = None) -> np.ndarray:
+    """RGB uint8 image of one text line."""
+    if font_path:
+        font = ImageFont.truetype(font_path, int(height * 0.7))
+        left, top, right, bottom = font.getbbox(text)
+        img = Image.new("L", (right - left + height // 2, height), 255)
+        ImageDraw.Draw(img).text(
+            (height // 4 - left, (height - (bottom - top)) // 2 - top), text, font=font, fill=0
+        )
+    else:
+        # Wide enough for any glyph; cropped to the drawn width below
+        img = Image.new("L", (len(text) * height + height // 2, height), 255)
+        draw = ImageDraw.Draw(img)
+        x = height // 4
+        for char in text:
+            x += height // 4 if char == " " else _glyph(draw, char, x, height)
+        img = img.crop((0, 0, x + height // 4, height))
+
+    return np.array(img.convert("RGB"))
+
+
+def random_text(rng, charset: list, min_chars: int, max_chars: int) -> str:
+    n = int(rng.integers(min_chars, max_chars + 1))
+    chars = rng.choice(charset, size=n).tolist()
+    # A word break roughly every 4-8 characters
+    for i in sorted(rng.integers(1, n, size=n // 6).tolist(), reverse=True):
+        chars.insert(i, " ")
+    return "".join(chars).strip()
+
+
+def random_lines(
+    n: int,
+    charset: list,
+    seed: int = 0,
+    min_chars: int = 3,
+    max_chars: int = 30,
+    height: int = 48,
+    font_path: str = None,
+) -> list:
+    """[(RGB line image, text)] with varying lengths (and so widths)."""
+    rng = np.random.default_rng(seed)
+    lines = []
+    for _ in range(n):
+        text = random_text(rng, charset, min_chars, max_chars)
+        lines.append((render_line(text, height, font_path), text))
+    return lines
+
+
+def make_pdf(
+    path: str,
+    n_pages: int,
+    charset: list,
+    lines_per_page: int = 20,
+    seed: int = 0,
+    font_path: str = None,
+):
+    """Write a multi-page A4-sized (150 dpi) PDF of synthetic text lines."""
+    rng = np.random.default_rng(seed)
+    pages = []
+    for _ in range(n_pages):
+        page = Image.new("RGB", (1240, 1754), "white")
+        y = 120
+        for _ in range(lines_per_page):
+            text = random_text(rng, charset, 10, 40)
+            line = Image.fromarray(render_line(text, 56, font_path))
+            if line.width > 1080:
+                line = line.crop((0, 0, 1080, line.height))
+            page.paste(line, (80, y))
+            y += 76
+        pages.append(page)
+    pages[0].save(path, save_all=True, append_images=pages[1:])
@@ -0,0 +1,86 @@
+import numpy as np
+
+
+# ------------------------------------------------------------
+# Line grouping and box merging (NumPy, no per-box Python loop)
+# ------------------------------------------------------------
+# Both steps are "start a new group when the next box does not touch the
+# running extent of the current one". With boxes sorted, the running
+# extent is a cumulative max, and group starts fall out of one comparison.
+
+def _as_boxes(boxes) -> np.ndarray:
+    return np.asarray(boxes, dtype=np.float64).reshape(-1, 4)
+
+
+def group_lines(boxes) -> np.ndarray:
+    """
+    Line id per xyxy box, numbered top to bottom.
+
+    Boxes are taken in order of vertical center; a box starts a new line
+    when its center is below the bottom edge of every box in the current
+    line. Because earlier lines all end above the current line's first
+    center, comparing against the cumulative max bottom of *all* previous
+    boxes is equivalent, which makes this a single vectorized pass.
+    """
+    arr = _as_boxes(boxes)
+    if len(arr) == 0:
+        return np.zeros(0, dtype=np.int64)
+
+    centers = (arr[:, 1] + arr[:, 3]) / 2
+    order = np.argsort(centers, kind="stable")
+
+    bottoms = np.maximum.accumulate(arr[order, 3])
+    starts = np.empty(len(arr), dtype=bool)
+    starts[0] = True
+    starts[1:] = centers[order][1:] > bottoms[:-1]
+
+    line_ids = np.empty(len(arr), dtype=np.int64)
+    line_ids[order] = np.cumsum(starts) - 1
+    return line_ids
+
+
+def reading_order_lines(boxes, max_gap: float = 0) -> list:
+    """
+    Group xyxy boxes into lines in reading order, optionally merging
+    neighbours on the same line whose horizontal gap is below max_gap.
+
+    Returns:
+    - list of lines (top to bottom), each a list of [x1, y1, x2, y2] int
+      boxes (left to right)
+    """
+    arr = _as_boxes(boxes)
+    if len(arr) == 0:
+        return []
+
+    line_ids = group_lines(arr)
+    order = np.lexsort((arr[:, 0], line_ids))
+    arr, line_ids = arr[order], line_ids[order]
+
+    line_starts = np.empty(len(arr), dtype=bool)
+    line_starts[0] = True
+    line_starts[1:] = line_ids[1:] != line_ids[:-1]
+
+    if max_gap > 0:
+        # Shift every line right of the previous one so the running max of
+        # x2 never carries over a line boundary
+        span = arr[:, 2].max() - arr[:, 0].min() + max_gap + 1
+        shift = line_ids * span
+        right = np.maximum.accumulate(arr[:, 2] + shift)
+        starts = line_starts.copy()
+        starts[1:] |= (arr[1:, 0] + shift[1:]) - right[:-1] >= max_gap
+    else:
+        starts = np.ones(len(arr), dtype=bool)
+
+    idx = np.flatnonzero(starts)
+    merged = np.stack([
+        np.minimum.reduceat(arr[:, 0], idx),
+        np.minimum.reduceat(arr[:, 1], idx),
+        np.maximum.reduceat(arr[:, 2], idx),
+        np.maximum.reduceat(arr[:, 3], idx),
+    ], axis=1).astype(np.int64)
+
+    # Split the merged boxes back into lines (one tolist, then list slices)
+    merged_lines = line_ids[idx]
+    bounds = [0, *(np.flatnonzero(np.diff(merged_lines)) + 1).tolist(), len(idx)]
+    merged = merged.tolist()
+    return [merged[a:b] for a, b in zip(bounds[:-1], bounds[1:])]
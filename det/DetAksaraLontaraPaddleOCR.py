@@ -13,41 +13,85 @@ class DetAksaraLontara:
         self.model = TextDetection(model_dir=model_dir)
 
     # ------------------------------------------------------------
-    # Detection Aksara Lontara
+    # Input conversion
     # ------------------------------------------------------------
-    def det_aksara_from_image(self, image_input):
+    @staticmethod
+    def _load_input(image_input):
         """
         Accepts:
         - file path (str)
         - PIL Image
         - numpy ndarray
-
-        Returns:
-        - detection result objects (list of OCRResult)
         """
 
         # Case 1: file path
         if isinstance(image_input, str):
             if not os.path.exists(image_input):
                 raise FileNotFoundError(f"Image not found: {image_input}")
-            input_data = image_input
+            return image_input
 
         # Case 2: PIL Image → convert to ndarray
         elif isinstance(image_input, Image.Image):
-            input_data = np.array(image_input.convert("RGB"))
+            return np.array(image_input.convert("RGB"))
 
         # Case 3: numpy array
         elif isinstance(image_input, np.ndarray):
-            input_data = image_input
+            return image_input
+
+        raise TypeError("Unsupported image type for detection.")
+
+    # ------------------------------------------------------------
+    # Detection Aksara Lontara
+    # ------------------------------------------------------------
+    def det_aksara_from_image(self, image_input):
+        """
+        Accepts:
+        - file path (str)
+        - PIL Image
+        - numpy ndarray
 
-        else:
-            raise TypeError("Unsupported image type for detection.")
+        Returns:
+        - detection result objects (list of OCRResult)
+        """
+        input_data = self._load_input(image_input)
 
         # Run detection
         output = self.model.predict(input=input_data, batch_size=1)
 
         return output   # return list of OCRResult objects
 
+    def det_aksara_batch(self, images, batch_size=8, prepass_side_len=None):
+        """
+        Detect many images (e.g. the pages of a PDF) with batch_size images
+        per forward pass.
+
+        With prepass_side_len, every image is first run with its longest
+        side limited to that length; images with no text region there
+        (blank pages) skip the full-resolution pass and get None.
+
+        Returns:
+        - one OCRResult (or None) per image, in input order
+        """
+        inputs = [self._load_input(image) for image in images]
+        results = [None] * len(inputs)
+
+        todo = list(range(len(inputs)))
+        if prepass_side_len:
+            coarse = self.model.predict(
+                input=inputs, batch_size=batch_size,
+                limit_side_len=prepass_side_len, limit_type="max"
+            )
+            todo = [i for i, res in zip(todo, coarse) if len(res["dt_polys"])]
+
+        if todo:
+            output = self.model.predict(
+                input=[inputs[i] for i in todo], batch_size=batch_size
+            )
+            for i, res in zip(todo, output):
+                results[i] = res
+
+        return results
+
 # Usage Example
 # detector = DetAksaraLontara()
 
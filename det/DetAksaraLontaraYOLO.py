@@ -4,6 +4,8 @@ import numpy as np
 from ultralytics import YOLO
 from PIL import Image
 
+from det.BoxGrouping import reading_order_lines
+
 
 class YoloAksaraLontara:
     def __init__(self, model_path: str):
@@ -13,35 +15,24 @@ class YoloAksaraLontara:
         self.model = YOLO(model_path)
 
     # ------------------------------------------------------------
-    # Helper: merge close boxes (same as your function)
+    # Helper: merge close boxes on the same text line
     # ------------------------------------------------------------
     def merge_boxes(self, boxes, max_gap=25):
-        if len(boxes) == 0:
-            return []
-
-        boxes = sorted(boxes, key=lambda b: b[0])
-        merged = []
-
-        current = boxes[0]
-        for b in boxes[1:]:
-            if b[0] - current[2] < max_gap:
-                current = [
-                    min(current[0], b[0]),
-                    min(current[1], b[1]),
-                    max(current[2], b[2]),
-                    max(current[3], b[3]),
-                ]
-            else:
-                merged.append(current)
-                current = b
+        """
+        Merge boxes whose horizontal gap is below max_gap, only within a
+        text line (grouped by vertical overlap), vectorized with NumPy.
 
-        merged.append(current)
-        return merged
+        Returns:
+        - merged xyxy boxes in reading order
+        """
+        lines = reading_order_lines(boxes, max_gap=max_gap)
+        return [box for line in lines for box in line]
 
     # ------------------------------------------------------------
-    # YOLO Detection Only
+    # Input conversion
     # ------------------------------------------------------------
-    def det_aksara_from_image(self, image_input, conf=0.75, merge_gap=25):
+    @staticmethod
+    def _load_rgb(image_input):
         """
         Accepts:
         - file path (str)
@@ -49,40 +40,82 @@ class YoloAksaraLontara:
         - numpy ndarray
 
         Returns:
-        - list of boxes in xyxy format: [x1, y1, x2, y2]
+        - numpy RGB array
         """
-
-        # ----------------------------------------
-        # Convert input to numpy RGB
-        # ----------------------------------------
         if isinstance(image_input, str):
             if not os.path.exists(image_input):
                 raise FileNotFoundError(f"Image not found: {image_input}")
             img = cv2.imread(image_input)
-            img_rgb = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
+            return cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
 
         elif isinstance(image_input, Image.Image):
-            img_rgb = np.array(image_input.convert("RGB"))
+            return np.array(image_input.convert("RGB"))
 
         elif isinstance(image_input, np.ndarray):
-            img_rgb = image_input
+            return image_input
+
+        raise TypeError("Unsupported image type for YOLO detection.")
 
-        else:
-            raise TypeError("Unsupported image type for YOLO detection.")
+    # ------------------------------------------------------------
+    # YOLO Detection Only
+    # ------------------------------------------------------------
+    def det_aksara_from_image(self, image_input, conf=0.75, merge_gap=25):
+        """
+        Accepts:
+        - file path (str)
+        - PIL Image
+        - numpy ndarray
 
-        # ----------------------------------------
-        # Run YOLO detection
-        # ----------------------------------------
-        results = self.model(img_rgb, conf=conf)
+        Returns:
+        - list of boxes in xyxy format: [x1, y1, x2, y2]
+        """
+        return self.det_aksara_batch([image_input], conf=conf, merge_gap=merge_gap)[0]
 
-        boxes = results[0].boxes.xyxy.cpu().numpy().astype(int).tolist()
+    def det_aksara_batch(
+        self, images, conf=0.75, merge_gap=25, batch_size=8, prepass_imgsz=None
+    ):
+        """
+        Detect many images (e.g. the pages of a PDF) with batch_size images
+        per forward pass.
 
-        # ----------------------------------------
-        # Optional merging
-        # ----------------------------------------
-        if merge_gap > 0:
-            boxes = self.merge_boxes(boxes, max_gap=merge_gap)
+        With prepass_imgsz, every image is first run at that reduced input
+        size; images with no detection there (blank pages) skip the
+        full-resolution pass and get an empty result.
 
+        Returns:
+        - one list of xyxy boxes per image, in input order
+        """
+        imgs = [self._load_rgb(image) for image in images]
+        results = [[] for _ in imgs]
+
+        todo = list(range(len(imgs)))
+        if prepass_imgsz:
+            hits = self._predict(imgs, todo, conf, batch_size, imgsz=prepass_imgsz)
+            todo = [i for i in todo if len(hits[i])]
+
+        for i, boxes in self._predict(imgs, todo, conf, batch_size).items():
+            # ----------------------------------------
+            # Optional merging (takes the array as-is)
+            # ----------------------------------------
+            if merge_gap > 0:
+                results[i] = self.merge_boxes(boxes, max_gap=merge_gap)
+            else:
+                results[i] = boxes.tolist()
+
+        return results
+
+    def _predict(self, imgs, indices, conf, batch_size, imgsz=None) -> dict:
+        """{image index: int xyxy array}, batch_size images per model call."""
+        kwargs = {"conf": conf, "verbose": False}
+        if imgsz:
+            kwargs["imgsz"] = imgsz
+
+        boxes = {}
+        for start in range(0, len(indices), max(1, batch_size)):
+            chunk = indices[start:start + batch_size]
+            results = self.model([imgs[i] for i in chunk], **kwargs)
+            for i, res in zip(chunk, results):
+                boxes[i] = res.boxes.xyxy.cpu().numpy().astype(int)
         return boxes
 
 # Usage Example
@@ -1,9 +1,145 @@
 import os
+import time
+import threading
 import cv2
 import numpy as np
 import onnxruntime as ort
 from PIL import Image
 
+from utils.OcrResultCache import OcrResultCache
+from utils.Metrics import INFERENCE_BATCH_SIZE, observe_stage
+
+
+# ------------------------------------------------------------
+# ONNX Runtime session profiles
+# ------------------------------------------------------------
+# - default: ORT defaults with full graph optimization
+# - latency: one request at a time, all cores on each run, threads spin
+# - throughput: many concurrent requests (thread pool / micro-batcher),
+#   few threads per run and no spinning so workers do not fight for cores
+# - low_memory: no arena or memory-pattern preallocation
+SESSION_PROFILES = {
+    "default": {},
+    "latency": {
+        "intra_op_threads": os.cpu_count() or 1,
+        "inter_op_threads": 1,
+        "allow_spinning": True,
+    },
+    "throughput": {
+        "intra_op_threads": 2,
+        "inter_op_threads": 1,
+        "allow_spinning": False,
+    },
+    "low_memory": {
+        "cpu_mem_arena": False,
+        "mem_pattern": False,
+        "allow_spinning": False,
+    },
+}
+
+
+def build_session_options(
+    profile: str = "default",
+    intra_op_threads: int = None,
+    inter_op_threads: int = None,
+    optimized_model_path: str = None,
+) -> ort.SessionOptions:
+    """
+    SessionOptions for a named profile; explicit thread counts override it.
+
+    With optimized_model_path, ORT writes the optimized graph there while
+    creating the session (ORT format when it ends with .ort), so later
+    processes can load it without re-running graph optimization.
+    """
+    if profile not in SESSION_PROFILES:
+        raise ValueError(
+            f"Unknown session profile '{profile}', expected one of {list(SESSION_PROFILES)}."
+        )
+    settings = SESSION_PROFILES[profile]
+
+    so = ort.SessionOptions()
+    so.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+    # The recognizer is a single chain of ops; parallel mode only adds overhead
+    so.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+
+    intra = intra_op_threads or settings.get("intra_op_threads")
+    inter = inter_op_threads or settings.get("inter_op_threads")
+    if intra:
+        so.intra_op_num_threads = int(intra)
+    if inter:
+        so.inter_op_num_threads = int(inter)
+
+    so.enable_cpu_mem_arena = settings.get("cpu_mem_arena", True)
+    so.enable_mem_pattern = settings.get("mem_pattern", True)
+    if "allow_spinning" in settings:
+        so.add_session_config_entry(
+            "session.intra_op.allow_spinning", "1" if settings["allow_spinning"] else "0"
+        )
+
+    if optimized_model_path:
+        so.optimized_model_filepath = optimized_model_path
+        if optimized_model_path.endswith(".ort"):
+            so.add_session_config_entry("session.save_model_format", "ORT")
+
+    return so
+
+
+# ------------------------------------------------------------
+# Normalization
+# ------------------------------------------------------------
+# (x / 255 - 0.5) / 0.5 for every uint8 value, computed in float32 exactly
+# as the per-pixel arithmetic would, so a table lookup gives bit-identical
+# inputs in one pass without float temporaries.
+NORMALIZE_LUT = (np.arange(256, dtype=np.float32) / 255.0 - 0.5) / 0.5
+
+
+class PreprocessBuffers:
+    """
+    Reusable model inputs for one thread: an NCHW batch per width bucket
+    and an HWC scratch plane for the lookup, so that once warm, filling a
+    batch allocates nothing.
+
+    Batches grow to the largest row count seen (in powers of two, up to
+    max_batch_size). Not thread-safe: a batch must stay untouched until
+    session.run returns, so OcrAksaraLontara keeps one instance per thread.
+    """
+
+    def __init__(self, img_height: int, max_batch_size: int):
+        self.img_height = img_height
+        self.max_batch_size = max_batch_size
+        self._batches = {}      # bucket width -> [capacity, 3, H, bucket]
+        self._scratch = np.empty(0, dtype=np.float32)
+
+    def batch(self, n: int, bucket: int) -> np.ndarray:
+        """A contiguous [n, 3, H, bucket] view; contents are stale until filled."""
+        buf = self._batches.get(bucket)
+        if buf is None or buf.shape[0] < n:
+            rows = max(n, min(self.max_batch_size, 1 << (n - 1).bit_length()))
+            buf = self._batches[bucket] = np.empty(
+                (rows, 3, self.img_height, bucket), dtype=np.float32
+            )
+        return buf[:n]
+
+    def fill(self, batch: np.ndarray, row: int, img: np.ndarray):
+        """Normalize a resized uint8 HWC crop into batch[row], zero-padding the rest."""
+        h, w = img.shape[:2]
+        if img.dtype == np.uint8:
+            if self._scratch.size < h * w * 3:
+                # Sized for the widest crop this bucket can hold
+                self._scratch = np.empty(h * batch.shape[3] * 3, dtype=np.float32)
+            hwc = self._scratch[:h * w * 3].reshape(h, w, 3)
+            cv2.LUT(img, NORMALIZE_LUT, dst=hwc)
+            np.copyto(batch[row, :, :, :w], hwc.transpose(2, 0, 1))
+        else:
+            batch[row, :, :, :w] = OcrAksaraLontara.normalize(img)
+
+        # Zero in normalized space, same as PaddleOCR's padding
+        batch[row, :, :, w:] = 0.0
+
+    def nbytes(self) -> int:
+        return self._scratch.nbytes + sum(buf.nbytes for buf in self._batches.values())
+
+
 class OcrAksaraLontara:
     def __init__(
         self,
@@ -12,6 +148,16 @@ class OcrAksaraLontara:
         img_height: int = 48,
         max_width: int = 320,
         use_gpu: bool = False,
+        width_buckets: tuple = (80, 160, 240, 320),
+        max_batch_size: int = 32,
+        cache=None,
+        session_profile: str = "default",
+        intra_op_threads: int = None,
+        inter_op_threads: int = None,
+        tile_long_lines: bool = False,
+        tile_overlap: int = 48,
+        max_tiles: int = 32,
+        pad_to_buckets: bool = False,
     ):
         if not os.path.exists(onnx_model_path):
             raise FileNotFoundError(f"ONNX model not found: {onnx_model_path}")
@@ -20,28 +166,79 @@ class OcrAksaraLontara:
         if use_gpu:
             providers = ["CUDAExecutionProvider", "CPUExecutionProvider"]
 
+        # onnx_model_path may also be an optimized .onnx/.ort file or an INT8
+        # model produced by ocr.OcrModelOptimizer
+        self.session_profile = session_profile
         self.session = ort.InferenceSession(
             onnx_model_path,
+            sess_options=build_session_options(
+                session_profile, intra_op_threads, inter_op_threads
+            ),
             providers=providers
         )
 
         self.input_name = self.session.get_inputs()[0].name
         self.output_name = self.session.get_outputs()[0].name
 
+        self.onnx_model_path = onnx_model_path
         self.img_height = img_height
         self.max_width = max_width
 
+        # Fixed input widths for batched inference; the last bucket must
+        # cover max_width so every resized crop fits somewhere.
+        self.width_buckets = sorted(set(int(w) for w in width_buckets if w <= max_width))
+        if not self.width_buckets or self.width_buckets[-1] < max_width:
+            self.width_buckets.append(max_width)
+        self.max_batch_size = max_batch_size
+
+        # By default crops run at their exact resized width, as single-image
+        # recognition does, and only crops of identical width share a batch.
+        # pad_to_buckets=True right-pads every crop to its width bucket for
+        # larger batches, but the padding changes what the model reads near
+        # the end of a line (often extra trailing characters), so results
+        # differ from ocr_aksara_from_image. Check with bench.bench_ocr_model
+        # before turning it on.
+        self.pad_to_buckets = pad_to_buckets
+
+        # Lines wider than max_width (after resizing to img_height) are
+        # squeezed into max_width by default. With tiling they are cut into
+        # max_width tiles overlapping by tile_overlap pixels, recognized in
+        # the same batch and stitched back together (see _merge_tiles).
+        self.tile_long_lines = tile_long_lines
+        self.tile_overlap = max(0, min(int(tile_overlap), max_width // 2))
+        # Bounds the work per crop: a resized line is never wider than
+        # max_tiles tiles; anything longer is squeezed into that width
+        self.max_tiles = max(1, int(max_tiles))
+        self.max_line_width = max_width + (self.max_tiles - 1) * (max_width - self.tile_overlap)
+
+        # Preallocated input batches, one PreprocessBuffers per calling thread
+        self._buffers = threading.local()
+
+        # Per-bucket throughput counters: {width: {"calls", "images", "seconds"}},
+        # updated from every thread that runs inference
+        self.bucket_stats = {}
+        self._stats_lock = threading.Lock()
+
+        # Optional utils.OcrResultCache; hits skip preprocess and session.run
+        self.cache = cache
+        self._model_hash = None
+
         # Load dictionary (must match training)
         with open(dict_path, "r", encoding="utf-8") as f:
             chars = [line.strip() for line in f]
 
         # CTC blank at index 0
         self.characters = [""] + chars
+        self._char_table = np.array(self.characters, dtype=object)
 
     # ------------------------------------------------------------
     # Preprocess (PaddleOCR-compatible)
     # ------------------------------------------------------------
-    def preprocess(self, image_input):
+    @staticmethod
+    def load_image(image_input):
+        """
+        Convert a file path, PIL Image or numpy array into an RGB HWC array.
+        """
         if isinstance(image_input, str):
             if not os.path.exists(image_input):
                 raise FileNotFoundError(f"Image not found: {image_input}")
@@ -63,45 +260,366 @@ class OcrAksaraLontara:
         if img.ndim == 2:
             img = cv2.cvtColor(img, cv2.COLOR_GRAY2RGB)
 
+        elif img.shape[2] == 4:
+            img = cv2.cvtColor(img, cv2.COLOR_RGBA2RGB)
+
+        return img
+
+    def resize(self, img, clamp: bool = True):
+        """
+        Resize an RGB array to img_height, keeping aspect ratio up to
+        max_width (up to max_line_width with clamp=False).
+        """
         h, w, _ = img.shape
         ratio = w / float(h)
-        new_w = int(self.img_height * ratio)
-        new_w = min(new_w, self.max_width)
+        new_w = max(1, int(self.img_height * ratio))
+        new_w = min(new_w, self.max_width if clamp else self.max_line_width)
 
-        img = cv2.resize(img, (new_w, self.img_height))
+        return cv2.resize(img, (new_w, self.img_height))
+
+    @staticmethod
+    def normalize(img):
+        """uint8 HWC -> float32 CHW in [-1, 1]."""
+        if img.dtype == np.uint8:
+            return cv2.LUT(img, NORMALIZE_LUT).transpose(2, 0, 1)  # CHW
         img = img.astype("float32") / 255.0
         img = (img - 0.5) / 0.5
-        img = img.transpose(2, 0, 1)  # CHW
-        img = np.expand_dims(img, axis=0)
+        return img.transpose(2, 0, 1)  # CHW
 
-        return img
+    def preprocess(self, image_input):
+        """One image as a fresh [1, 3, H, W] input (the caller owns it)."""
+        img = self.resize(self.load_image(image_input))
+        batch = np.empty((1, 3, self.img_height, img.shape[1]), dtype=np.float32)
+        np.copyto(batch[0], self.normalize(img))
+        return batch
+
+    def preprocess_buffers(self) -> PreprocessBuffers:
+        """This thread's reusable input batches."""
+        buffers = getattr(self._buffers, "value", None)
+        if buffers is None:
+            buffers = self._buffers.value = PreprocessBuffers(self.img_height, self.max_batch_size)
+        return buffers
+
+    @property
+    def model_hash(self) -> str:
+        if self._model_hash is None:
+            self._model_hash = OcrResultCache.file_hash(self.onnx_model_path)
+        return self._model_hash
+
+    def cache_params(self) -> dict:
+        """Everything besides the pixels that changes the recognized text."""
+        return {
+            "img_height": self.img_height,
+            "max_width": self.max_width,
+            "width_buckets": tuple(self.width_buckets),
+            "tiling": ((self.tile_overlap, self.max_tiles) if self.tile_long_lines else None),
+            "pad_to_buckets": self.pad_to_buckets,
+            "model": self.model_hash,
+        }
+
+    def bucket_width(self, width: int) -> int:
+        """Smallest configured bucket that fits a resized crop of this width."""
+        for bucket in self.width_buckets:
+            if width <= bucket:
+                return bucket
+        return self.width_buckets[-1]
+
+    def _tiles(self, img):
+        """
+        (x offset, view) tiles of a resized line. Every tile of a long line
+        is exactly max_width wide, so they all share one bucket shape; the
+        last tile is aligned to the right edge.
+        """
+        w = img.shape[1]
+        if not self.tile_long_lines or w <= self.max_width:
+            return [(0, img)]
+
+        stride = self.max_width - self.tile_overlap
+        starts = list(range(0, w - self.max_width, stride)) + [w - self.max_width]
+        return [(x, img[:, x:x + self.max_width]) for x in starts]
 
     # ------------------------------------------------------------
     # CTC Decode
     # ------------------------------------------------------------
-    def ctc_decode(self, preds):
-        idxs = preds.argmax(axis=2)[0]
+    @staticmethod
+    def _to_probs(preds):
+        """Apply softmax over classes unless the model already outputs probabilities."""
+        preds = np.asarray(preds, dtype=np.float32)
+        sums = preds.sum(axis=-1)
+        if preds.min() >= 0 and np.allclose(sums, 1.0, atol=1e-3):
+            return preds
+
+        exp = np.exp(preds - preds.max(axis=-1, keepdims=True))
+        return exp / exp.sum(axis=-1, keepdims=True)
+
+    def ctc_decode_batch(self, preds, lengths=None, return_positions: bool = False):
+        """
+        Greedy CTC decode of a whole [N, T, C] batch.
+
+        argmax, repeat-collapse and blank removal are done with array masks;
+        only the final string join is per line.
+
+        Args:
+        - lengths: optional valid time steps per row; later steps are ignored
+        - return_positions: also return the time step of every character
+
+        Returns:
+        - list of {"text", "confidence", "char_confidences"} per row, where
+          char confidences are the softmax max-prob of each emitted character
+          and the line confidence is their mean (0.0 for an empty line)
+        """
+        probs = self._to_probs(preds)
+        n, t, _ = probs.shape
+
+        idxs = probs.argmax(axis=2)
+        max_probs = np.take_along_axis(probs, idxs[..., None], axis=2)[..., 0]
+
+        prev = np.empty_like(idxs)
+        prev[:, 0] = -1
+        prev[:, 1:] = idxs[:, :-1]
+
+        keep = (idxs != prev) & (idxs != 0) & (idxs < len(self.characters))
+        if lengths is not None:
+            keep &= np.arange(t)[None, :] < np.asarray(lengths)[:, None]
 
-        last_idx = -1
-        text = []
+        results = []
+        for row in range(n):
+            row_idxs = idxs[row][keep[row]]
+            row_probs = max_probs[row][keep[row]]
+            res = {
+                "text": "".join(self._char_table[row_idxs].tolist()),
+                "confidence": float(row_probs.mean()) if row_probs.size else 0.0,
+                "char_confidences": row_probs.tolist(),
+            }
+            if return_positions:
+                res["chars"] = self._char_table[row_idxs].tolist()
+                res["positions"] = np.flatnonzero(keep[row]).tolist()
+            results.append(res)
 
-        for idx in idxs:
-            if idx != last_idx and idx != 0:
-                if idx < len(self.characters):
-                    text.append(self.characters[idx])
-            last_idx = idx
+        return results
 
-        return "".join(text)
+    @staticmethod
+    def _merge_tiles(parts, tile_width: int):
+        """
+        Stitch the decodes of overlapping tiles into one line.
+
+        Args:
+        - parts: [(x offset, decode with positions, pixels per time step)]
+          in left-to-right order
+
+        Each overlap is cut at its midpoint: characters left of the cut
+        come from the left tile, the rest from the right one. A character
+        straddling the cut can be emitted by both tiles at nearly the same
+        x; such a duplicate is dropped.
+        """
+        cuts = [
+            (parts[k + 1][0] + parts[k][0] + tile_width) / 2.0
+            for k in range(len(parts) - 1)
+        ]
+        bounds = [float("-inf")] + cuts + [float("inf")]
+
+        chars, probs, xs = [], [], []
+        for k, (offset, res, step) in enumerate(parts):
+            for char, prob, t in zip(res["chars"], res["char_confidences"], res["positions"]):
+                x = offset + (t + 0.5) * step
+                if not bounds[k] <= x < bounds[k + 1]:
+                    continue
+                if chars and char == chars[-1] and x - xs[-1] < 1.5 * step:
+                    probs[-1] = max(probs[-1], prob)
+                    continue
+                chars.append(char)
+                probs.append(prob)
+                xs.append(x)
+
+        return {
+            "text": "".join(chars),
+            "confidence": float(np.mean(probs)) if probs else 0.0,
+            "char_confidences": probs,
+        }
+
+    def ctc_decode(self, preds):
+        return self.ctc_decode_batch(preds[:1])[0]["text"]
 
     # ------------------------------------------------------------
     # OCR Aksara Lontara (ONNX)
     # ------------------------------------------------------------
     def ocr_aksara_from_image(self, image_input):
-        input_tensor = self.preprocess(image_input)
+        """
+        Recognize one crop at its exact resized width, without bucket
+        padding, whatever pad_to_buckets is set to.
+        """
+        return self._recognize([image_input], pad_to_buckets=False)[0]["text"]
+
+    def ocr_aksara_from_array(self, img: np.ndarray):
+        """
+        OCR a raw HWC uint8 RGB array (e.g. a pdfium bitmap view).
+
+        The array is used as-is: no PIL conversion and no copy before
+        resize, so it may be a view over a foreign buffer.
+        """
+        if not isinstance(img, np.ndarray) or img.dtype != np.uint8 or img.ndim != 3:
+            raise TypeError("Expected a HWC uint8 numpy array.")
+
+        return self._recognize([img], pad_to_buckets=False)[0]["text"]
+
+    def ocr_aksara_batch(self, images, return_confidence: bool = False, pad_to_buckets: bool = None):
+        """
+        Recognize many crops with one ONNX call per width bucket.
+
+        Crops are sorted by aspect ratio and crops of the same resized width
+        run together, so every result matches ocr_aksara_from_image. With
+        pad_to_buckets=True crops are instead right-padded to their bucket
+        width: batches are larger, but the padding can change a result (see
+        __init__); pad_to_buckets overrides the instance setting for one
+        call. With tile_long_lines, the tiles of long lines join the
+        max_width batch alongside other crops.
+
+        Returns:
+        - list of strings, in the same order as `images`, or with
+          return_confidence=True a list of
+          {"text", "confidence", "char_confidences"} dicts
+        """
+        if pad_to_buckets is None:
+            pad_to_buckets = self.pad_to_buckets
+        results = self._recognize(images, pad_to_buckets=pad_to_buckets)
+        if return_confidence:
+            return results
+        return [res["text"] for res in results]
+
+    def warmup(self):
+        """Run one dummy crop per width bucket, bypassing the result cache."""
+        dummies = [
+            np.full((self.img_height, width, 3), 255, dtype=np.uint8)
+            for width in self.width_buckets
+        ]
+        self._recognize(dummies, pad_to_buckets=self.pad_to_buckets, use_cache=False)
+
+    def _recognize(self, images, pad_to_buckets: bool, use_cache: bool = True) -> list:
+        if len(images) == 0:
+            return []
+
+        # One cache reference for the whole call; None skips lookups and stores
+        cache = self.cache if use_cache else None
+
+        t_start = time.perf_counter()
+        t_infer = t_decode = 0.0
+
+        results = [None] * len(images)
+        pixels = [self.load_image(image) for image in images]
+
+        # Cache lookup on the decoded pixels, before any preprocessing
+        keys = [None] * len(images)
+        todo = list(range(len(images)))
+        if cache is not None:
+            params = {**self.cache_params(), "pad_to_buckets": pad_to_buckets}
+            todo = []
+            for i, img in enumerate(pixels):
+                keys[i] = cache.make_key(img, **params)
+                cached = cache.get(keys[i])
+                if cached is None:
+                    todo.append(i)
+                else:
+                    results[i] = dict(cached)
+
+        # Work units: a whole crop, or one tile of a long line
+        units = []     # (crop index, x offset, resized pixels)
+        for i in todo:
+            img = self.resize(pixels[i], clamp=not self.tile_long_lines)
+            units.extend((i, x, tile) for x, tile in self._tiles(img))
+        widths = [tile.shape[1] for _, _, tile in units]
+
+        # Group units by bucket (or exact width), narrowest aspect ratio first
+        order = sorted(range(len(units)), key=lambda u: widths[u])
+        groups = {}
+        for u in order:
+            bucket = self.bucket_width(widths[u]) if pad_to_buckets else widths[u]
+            groups.setdefault(bucket, []).append(u)
+
+        buffers = self.preprocess_buffers()
+        decoded = [None] * len(units)
+        for bucket, indices in groups.items():
+            for start in range(0, len(indices), self.max_batch_size):
+                chunk = indices[start:start + self.max_batch_size]
+
+                # Normalized in place into this thread's reused bucket batch
+                # (exact widths are too many to keep a buffer for each)
+                if pad_to_buckets:
+                    batch = buffers.batch(len(chunk), bucket)
+                else:
+                    batch = np.empty((len(chunk), 3, self.img_height, bucket), dtype=np.float32)
+                for row, u in enumerate(chunk):
+                    buffers.fill(batch, row, units[u][2])
+
+                t0 = time.perf_counter()
+                preds = self.session.run(
+                    [self.output_name],
+                    {self.input_name: batch}
+                )[0]
+                t1 = time.perf_counter()
+                # Exact widths are reported under their bucket
+                self._record_bucket(self.bucket_width(bucket), len(chunk), t1 - t0)
+                INFERENCE_BATCH_SIZE.observe(self.bucket_width(bucket), value=len(chunk))
+
+                step = bucket / preds.shape[1]
+                rows = self.ctc_decode_batch(preds, return_positions=self.tile_long_lines)
+                for row, u in enumerate(chunk):
+                    decoded[u] = (units[u][1], rows[row], step)
+
+                t_infer += t1 - t0
+                t_decode += time.perf_counter() - t1
+
+        # Reassemble crops from their units (units of a crop are contiguous
+        # and already in left-to-right order)
+        t0 = time.perf_counter()
+        parts = {}
+        for (i, _, _), part in zip(units, decoded):
+            parts.setdefault(i, []).append(part)
+
+        for i, crop_parts in parts.items():
+            if len(crop_parts) == 1:
+                res = crop_parts[0][1]
+                res.pop("chars", None)
+                res.pop("positions", None)
+            else:
+                res = self._merge_tiles(crop_parts, self.max_width)
+
+            results[i] = res
+            if keys[i] is not None:
+                cache.set(keys[i], res)
+
+        t_end = time.perf_counter()
+        t_decode += t_end - t0
+        observe_stage("ocr.inference", t_infer)
+        observe_stage("ocr.decode", t_decode)
+        # Everything else: image loading, cache lookups, resize, normalize
+        observe_stage("ocr.preprocess", (t_end - t_start) - t_infer - t_decode)
+
+        return results
+
+    def _record_bucket(self, bucket: int, n_images: int, seconds: float):
+        with self._stats_lock:
+            stats = self.bucket_stats.setdefault(
+                bucket, {"calls": 0, "images": 0, "seconds": 0.0}
+            )
+            stats["calls"] += 1
+            stats["images"] += n_images
+            stats["seconds"] += seconds
+
+    def batch_throughput(self) -> dict:
+        """
+        Inference throughput per bucket width.
 
-        preds = self.session.run(
-            [self.output_name],
-            {self.input_name: input_tensor}
-        )[0]
+        Returns:
+        - {width: {"calls", "images", "seconds", "images_per_sec"}}
+        """
+        with self._stats_lock:
+            snapshot = {bucket: dict(stats) for bucket, stats in self.bucket_stats.items()}
 
-        return self.ctc_decode(preds)
+        report = {}
+        for bucket, stats in sorted(snapshot.items()):
+            seconds = stats["seconds"]
+            report[bucket] = {
+                **stats,
+                "images_per_sec": stats["images"] / seconds if seconds > 0 else 0.0,
+            }
+        return report
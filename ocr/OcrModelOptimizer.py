@@ -0,0 +1,111 @@
+"""
+Offline preparation of the recognizer model.
+
+- optimize: run ORT graph optimization once and save the result as an
+  optimized .onnx or an ORT-format .ort file, which loads faster
+- quantize: dynamic INT8 quantization (weights stored as int8, activations
+  quantized at run time); needs the `onnx` package
+
+Point the service at the output with AKSARA_OCR_MODEL_PATH, and check
+accuracy with bench/bench_ocr_model.py before switching.
+
+Usage:
+    python -m ocr.OcrModelOptimizer optimize model.onnx model.opt.ort
+    python -m ocr.OcrModelOptimizer quantize model.onnx model.int8.onnx
+"""
+import os
+import argparse
+
+import onnxruntime as ort
+
+from ocr.OcrAksaraLontara import build_session_options
+
+
+def optimize_model(src_path: str, dst_path: str, hardware_specific: bool = False) -> str:
+    """
+    Save the ORT-optimized graph of src_path to dst_path (.onnx or .ort).
+
+    By default only portable (extended level) optimizations are baked in;
+    hardware_specific=True also applies layout transforms that tie the
+    file to this machine's CPU.
+    """
+    if not os.path.exists(src_path):
+        raise FileNotFoundError(f"ONNX model not found: {src_path}")
+
+    so = build_session_options(optimized_model_path=dst_path)
+    if not hardware_specific:
+        so.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_EXTENDED
+    # Creating the session writes the optimized model
+    ort.InferenceSession(src_path, sess_options=so, providers=["CPUExecutionProvider"])
+    return dst_path
+
+
+def quantize_model(
+    src_path: str,
+    dst_path: str,
+    op_types: tuple = ("MatMul", "Gemm"),
+    per_channel: bool = False,
+) -> str:
+    """
+    Dynamic INT8 quantization of src_path into dst_path.
+
+    Only MatMul/Gemm (the SVTR/LSTM head) are quantized by default: dynamic
+    ConvInteger is usually slower than float Conv on the CPU provider and
+    costs more accuracy. Pass op_types=None to quantize every supported op.
+    """
+    if not os.path.exists(src_path):
+        raise FileNotFoundError(f"ONNX model not found: {src_path}")
+
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+    from onnxruntime.quantization.shape_inference import quant_pre_process
+
+    # Shape inference and constant folding first, as ORT recommends
+    pre_path = dst_path + ".pre.onnx"
+    try:
+        quant_pre_process(src_path, pre_path, skip_symbolic_shape=True)
+        quantize_dynamic(
+            pre_path,
+            dst_path,
+            op_types_to_quantize=list(op_types) if op_types else None,
+            per_channel=per_channel,
+            weight_type=QuantType.QInt8,
+        )
+    finally:
+        if os.path.exists(pre_path):
+            os.remove(pre_path)
+
+    return dst_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    opt = sub.add_parser("optimize", help="save the optimized graph")
+    opt.add_argument("src")
+    opt.add_argument("dst", help="output path, .onnx or .ort")
+    opt.add_argument("--hardware-specific", action="store_true",
+                     help="also bake in CPU-specific layout transforms")
+
+    quant = sub.add_parser("quantize", help="dynamic INT8 quantization")
+    quant.add_argument("src")
+    quant.add_argument("dst")
+    quant.add_argument("--all-ops", action="store_true", help="also quantize Conv layers")
+    quant.add_argument("--per-channel", action="store_true")
+
+    args = parser.parse_args()
+    if args.command == "optimize":
+        out = optimize_model(args.src, args.dst, hardware_specific=args.hardware_specific)
+    else:
+        out = quantize_model(
+            args.src,
+            args.dst,
+            op_types=None if args.all_ops else ("MatMul", "Gemm"),
+            per_channel=args.per_channel,
+        )
+
+    print(f"{out}: {os.path.getsize(out) / 1e6:.2f} MB")
+
+
+if __name__ == "__main__":
+    main()
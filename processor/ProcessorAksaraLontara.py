@@ -1,23 +1,26 @@
 import os
-import json
-from io import BytesIO
+import time
+import threading
+import itertools
 from dotenv import load_dotenv
 
-from PIL import Image
-import pypdfium2 as pdfium
-import google.generativeai as genai
+import numpy as np
 
-from prompts.PromptAksaraLontara import PromptAksaraLontara
-from ocr.OcrAksaraLontara import OcrAksaraLontara
+from det.BoxGrouping import reading_order_lines
+from utils.TranslationScheduler import TranslationScheduler
+from utils.Metrics import stage
+from translator.TranslatorAksaraLontara import create_translator
+
+# Heavy modules (onnxruntime, cv2, pypdfium2, google-generativeai, detector
+# frameworks) are imported on first use, so importing this module and
+# constructing the processor stay cheap; see warmup().
 
 # Load environment variables
 load_dotenv()
 
-api_key = os.getenv("GEMINI_API_KEY")
-if not api_key:
-    raise RuntimeError("Missing GEMINI_API_KEY in environment variables.")
-
-genai.configure(api_key=api_key)
+# Line detection stages selectable per request. "none" feeds the whole
+# page to the recognizer as before.
+DETECTORS = ("none", "yolo", "paddle")
 
 
 class ProcessorAksaraLontara:
@@ -27,103 +30,607 @@ class ProcessorAksaraLontara:
         model_name: str = "gemini-2.5-flash",
         ocr_model_path: str = "models/buginese_rec.onnx",
         ocr_dict_path: str = "models/dict.txt",
+        ocr_session_profile: str = "default",
+        ocr_intra_op_threads: int = None,
+        ocr_inter_op_threads: int = None,
+        ocr_tile_long_lines: bool = False,
+        ocr_tile_overlap: int = 48,
+        ocr_max_tiles: int = 32,
+        ocr_pad_to_buckets: bool = False,
+        yolo_model_path: str = None,
+        det_model_dir: str = None,
+        detect_batch_size: int = 4,
+        detect_prepass_size: int = None,
+        bulk_batch_size: int = 16,
+        rasterizer=None,
+        translation_cache=None,
+        ocr_cache=None,
+        min_line_confidence: float = 0.0,
+        batch_max_latency_ms: float = 0.0,
+        batch_max_size: int = 32,
+        max_segment_tokens: int = 1000,
+        translation_concurrency: int = 4,
+        context_cache_ttl: int = 0,
+        context_cache_factory=None,
+        translator_backend: str = "gemini",
+        translator=None,
+        inference_client=None,
     ):
-        self.model_name = model_name
-        self.model = genai.GenerativeModel(self.model_name)
+        self._lock = threading.RLock()
+        self.ready = False
 
-        # ✅ ONNX OCR initialization
-        self.ocr = OcrAksaraLontara(
-            onnx_model_path=ocr_model_path,
-            dict_path=ocr_dict_path
+        # Translation backend: "gemini" (needs GEMINI_API_KEY) or "local"
+        # (offline rule-based transliteration). An instance can be passed in;
+        # otherwise it is built on first use.
+        self._translator = translator
+        self.translator_backend = translator_backend
+        self._translator_kwargs = {"dict_path": ocr_dict_path}
+        if translator_backend == "gemini":
+            self._translator_kwargs = {
+                "model_name": model_name,
+                "context_cache_ttl": context_cache_ttl,
+                "context_cache_factory": context_cache_factory,
+            }
+
+        # Long documents are split into token-budgeted segments and
+        # translated concurrently with retry/backoff
+        self.translation_scheduler = TranslationScheduler(
+            self._translate_text,
+            max_segment_tokens=max_segment_tokens,
+            max_concurrency=translation_concurrency
         )
 
+        # ONNX OCR, built on first use (see the ocr property)
+        self.ocr_model_path = ocr_model_path
+        self.ocr_dict_path = ocr_dict_path
+        # ONNX Runtime session profile (see ocr.OcrAksaraLontara.SESSION_PROFILES)
+        # and overlapping-tile recognition of lines wider than max_width
+        self.ocr_options = {
+            "session_profile": ocr_session_profile,
+            "intra_op_threads": ocr_intra_op_threads,
+            "inter_op_threads": ocr_inter_op_threads,
+            "tile_long_lines": ocr_tile_long_lines,
+            "tile_overlap": ocr_tile_overlap,
+            "max_tiles": ocr_max_tiles,
+            "pad_to_buckets": ocr_pad_to_buckets,
+        }
+        self._ocr = None
+
+        # Optional utils.InferenceServer.InferenceClient: recognition and
+        # detection run in a shared model-owning process instead of here
+        self.inference_client = inference_client
+
+        # Optional utils.OcrResultCache shared with self.ocr. The processor
+        # also caches whole-page text so detection is skipped on a hit.
+        self.ocr_cache = ocr_cache
+
+        # OCR lines below this mean char confidence are not sent to Gemini;
+        # they are returned under "low_confidence_lines" for review instead
+        self.min_line_confidence = min_line_confidence
+
+        # With batch_max_latency_ms > 0, crops from concurrent requests are
+        # coalesced by a micro-batching scheduler before reaching ONNX
+        self.batch_max_latency_ms = batch_max_latency_ms
+        self.batch_max_size = batch_max_size
+        self.ocr_batcher = None
+
+        # Detectors are optional and pull in heavy dependencies
+        # (ultralytics / paddleocr), so they are built on first use.
+        self.yolo_model_path = yolo_model_path
+        self.det_model_dir = det_model_dir
+        self._yolo_detector = None
+        self._paddle_detector = None
+
+        # Pages detected per forward pass, and an optional reduced input size
+        # for a first pass that lets blank pages skip full-resolution detection
+        self.detect_batch_size = max(1, detect_batch_size)
+        self.detect_prepass_size = detect_prepass_size
+
+        # Images of a bulk upload OCR'd together (see iter_translation_from_images)
+        self.bulk_batch_size = max(1, bulk_batch_size)
+
+        # Optional utils.PdfRasterizer: renders PDF pages on a process pool
+        # and returns them through shared memory, in page order.
+        self.rasterizer = rasterizer
+
+        # Optional utils.TranslationCache; a hit skips the translator call
+        self.translation_cache = translation_cache
+
     # ------------------------------------------------------------
-    # Utils
+    # Lazy components
     # ------------------------------------------------------------
-    @staticmethod
-    def _clean_json_text(text: str) -> str:
+    @property
+    def translator(self):
+        if self._translator is None:
+            with self._lock:
+                if self._translator is None:
+                    self._translator = create_translator(
+                        self.translator_backend, **self._translator_kwargs
+                    )
+        return self._translator
+
+    @property
+    def ocr(self):
+        if self.inference_client is not None:
+            return self.inference_client
+
+        if self._ocr is None:
+            with self._lock:
+                if self._ocr is None:
+                    from ocr.OcrAksaraLontara import OcrAksaraLontara
+                    self._ocr = OcrAksaraLontara(
+                        onnx_model_path=self.ocr_model_path,
+                        dict_path=self.ocr_dict_path,
+                        cache=self.ocr_cache,
+                        **self.ocr_options
+                    )
+        return self._ocr
+
+    @property
+    def recognizer(self):
+        """The micro-batching scheduler when enabled, otherwise the ONNX recognizer."""
+        # The inference server does its own batching across workers
+        if self.batch_max_latency_ms <= 0 or self.inference_client is not None:
+            return self.ocr
+
+        if self.ocr_batcher is None:
+            with self._lock:
+                if self.ocr_batcher is None:
+                    from utils.OcrBatchScheduler import OcrBatchScheduler
+                    self.ocr_batcher = OcrBatchScheduler(
+                        self.ocr,
+                        max_batch_size=self.batch_max_size,
+                        max_latency_ms=self.batch_max_latency_ms
+                    )
+        return self.ocr_batcher
+
+    @property
+    def ocr_loaded(self) -> bool:
+        return self._ocr is not None or self.inference_client is not None
+
+    @property
+    def translator_loaded(self) -> bool:
+        return self._translator is not None
+
+    def warmup(self) -> dict:
         """
-        Remove markdown fences and ensure JSON only.
+        Build the recognizer and translator and run one dummy inference per
+        width bucket, so the first real request pays no load/compile cost.
+
+        Returns:
+        - seconds spent per step
         """
-        text = text.strip()
+        timings = {}
 
-        # Remove markdown fences ```json ... ```
-        if text.startswith("```"):
-            lines = text.split("\n")
-            lines = [line for line in lines if not line.startswith("```")]
-            text = "\n".join(lines).strip()
+        t0 = time.perf_counter()
+        ocr = self.ocr
+        timings["load_ocr"] = time.perf_counter() - t0
 
-        return text
+        t0 = time.perf_counter()
+        # Dummy results must not enter the OCR cache
+        ocr.warmup()
+        timings["ocr_inference"] = time.perf_counter() - t0
 
-    @staticmethod
-    def _parse_json(text: str) -> dict:
+        t0 = time.perf_counter()
+        self.translator
+        timings["load_translator"] = time.perf_counter() - t0
+
+        self.ready = True
+        return timings
+
+    # ------------------------------------------------------------
+    # PDF rendering
+    # ------------------------------------------------------------
+    def _pdf_page_batches(
+        self, pdf_path: str, scale: float = 2, window: int = None, group: int = 1,
+        start_page: int = 0
+    ):
         """
-        Convert cleaned JSON string into dict safely.
+        Yield lists of RGB HWC uint8 page arrays, in page order.
+
+        Without a rasterizer pages are rendered lazily on the calling
+        thread, `group` per batch, as views over pdfium's bitmaps. With a
+        rasterizer each batch is a page range rendered by a worker process
+        into shared memory; `window` caps the ranges in flight.
+
+        Pages before start_page (0-based) are skipped without rendering.
+        Arrays are only valid until the next batch is requested.
         """
+        if not os.path.exists(pdf_path):
+            raise FileNotFoundError(f"PDF not found: {pdf_path}")
+
+        if self.rasterizer is not None:
+            for batch in self.rasterizer.iter_page_batches(pdf_path, scale, window, start_page):
+                arrays = [arr for _, arr in batch]
+                del batch
+                yield arrays
+            return
+
+        import pypdfium2 as pdfium
+        from utils.PdfRasterizer import PDFIUM_LOCK, render_bitmap
+
+        # pdfium calls hold the process-wide lock; OCR of the yielded views
+        # runs outside it, so concurrent documents only serialize rendering
+        with PDFIUM_LOCK:
+            pdf = pdfium.PdfDocument(pdf_path)
+            n_pages = len(pdf)
         try:
-            return json.loads(text)
-        except Exception:
-            # Fallback to empty JSON-safe structure
-            return {"aksara": "", "latin": "", "indonesia": ""}
+            for start in range(start_page, n_pages, max(1, group)):
+                with PDFIUM_LOCK:
+                    pages = [pdf.get_page(i) for i in range(start, min(start + group, n_pages))]
+                    bitmaps = [render_bitmap(page, scale) for page in pages]
+                    arrays = [bitmap.to_numpy() for bitmap in bitmaps]
+                try:
+                    yield arrays
+                finally:
+                    # Also on early close, so no pdfium object is left for
+                    # the garbage collector to free outside the lock
+                    del arrays
+                    with PDFIUM_LOCK:
+                        for bitmap, page in zip(bitmaps, pages):
+                            bitmap.close()
+                            page.close()
+        finally:
+            with PDFIUM_LOCK:
+                pdf.close()
+
+    # ------------------------------------------------------------
+    # Detection (detect -> crop -> batch-recognize)
+    # ------------------------------------------------------------
+    @property
+    def yolo_detector(self):
+        if self._yolo_detector is None:
+            if not self.yolo_model_path:
+                raise RuntimeError("YOLO detector is not configured (yolo_model_path).")
+            from det.DetAksaraLontaraYOLO import YoloAksaraLontara
+            self._yolo_detector = YoloAksaraLontara(self.yolo_model_path)
+        return self._yolo_detector
+
+    @property
+    def paddle_detector(self):
+        if self._paddle_detector is None:
+            if not self.det_model_dir:
+                raise RuntimeError("PaddleOCR detector is not configured (det_model_dir).")
+            from det.DetAksaraLontaraPaddleOCR import DetAksaraLontara
+            self._paddle_detector = DetAksaraLontara(self.det_model_dir)
+        return self._paddle_detector
 
     @staticmethod
-    def _pdf_to_images(pdf_path: str):
-        """Yield PIL images for each PDF page."""
-        if not os.path.exists(pdf_path):
-            raise FileNotFoundError(f"PDF not found: {pdf_path}")
+    def _sort_reading_order(boxes):
+        """
+        Group xyxy boxes into text lines, top-to-bottom, each line sorted
+        left-to-right. A box starts a new line when its vertical center is
+        below the current line's bottom edge.
+        """
+        return reading_order_lines(boxes)
+
+    @staticmethod
+    def _paddle_boxes(res) -> list:
+        """xyxy boxes around the polygons of one PaddleOCR result (None: no text)."""
+        boxes = []
+        if res is None:
+            return boxes
+        for poly in res["dt_polys"]:
+            poly = np.asarray(poly)
+            x1, y1 = poly.min(axis=0)
+            x2, y2 = poly.max(axis=0)
+            boxes.append([int(x1), int(y1), int(x2), int(y2)])
+        return boxes
+
+    def _detect_lines_batch(self, images, detector: str) -> list:
+        """
+        Detect several RGB arrays together (detect_batch_size per forward
+        pass) and return, per image, xyxy boxes grouped into lines in
+        reading order.
+        """
+        if self.inference_client is not None:
+            return self.inference_client.detect_lines_batch(images, detector)
+
+        if detector == "yolo":
+            per_image = self.yolo_detector.det_aksara_batch(
+                images, batch_size=self.detect_batch_size,
+                prepass_imgsz=self.detect_prepass_size
+            )
+
+        elif detector == "paddle":
+            per_image = [
+                self._paddle_boxes(res)
+                for res in self.paddle_detector.det_aksara_batch(
+                    images, batch_size=self.detect_batch_size,
+                    prepass_side_len=self.detect_prepass_size
+                )
+            ]
+
+        else:
+            raise ValueError(f"Unknown detector '{detector}', expected one of {DETECTORS}.")
+
+        return [self._sort_reading_order(boxes) for boxes in per_image]
+
+    def _detect_lines(self, img, detector: str):
+        """Return xyxy boxes for an RGB array, grouped into lines in reading order."""
+        return self._detect_lines_batch([img], detector)[0]
 
-        pdf = pdfium.PdfDocument(pdf_path)
-        for i in range(len(pdf)):
-            page = pdf.get_page(i)
-            yield page.render(scale=2).to_pil()
+    def _ocr_image(self, image_input, detector: str = "none") -> list:
+        """
+        OCR a page, optionally detecting and cropping text regions first.
+
+        Returns:
+        - list of {"text", "confidence"} lines in reading order
+        """
+        return self._ocr_pages([image_input], detector)[0]
+
+    def _ocr_pages(self, images, detector: str = "none") -> list:
+        """
+        OCR several pages. With a detector, pages not in the OCR cache are
+        detected together and all their crops are recognized in one batch.
+
+        Returns:
+        - per page, a list of {"text", "confidence"} lines in reading order
+        """
+        if not detector or detector == "none":
+            # Whole images keep exact-width recognition, as
+            # ocr_aksara_from_image does, even with bucket padding on
+            with stage("ocr"):
+                regions = self.recognizer.ocr_aksara_batch(
+                    images, return_confidence=True, pad_to_buckets=False
+                )
+            return [
+                [{"text": res["text"], "confidence": res["confidence"]}]
+                for res in regions
+            ]
+
+        imgs = [self.ocr.load_image(image) for image in images]
+        results = [None] * len(imgs)
+
+        keys = [None] * len(imgs)
+        if self.ocr_cache is not None:
+            params = self.ocr.cache_params()
+            for p, img in enumerate(imgs):
+                keys[p] = self.ocr_cache.make_key(img, detector=detector, **params)
+                cached = self.ocr_cache.get(keys[p])
+                if cached is not None:
+                    results[p] = [dict(line) for line in cached]
+
+        todo = [p for p in range(len(imgs)) if results[p] is None]
+        page_lines = []
+        if todo:
+            with stage("detect"):
+                page_lines = self._detect_lines_batch([imgs[p] for p in todo], detector)
+
+        # Slices are views into the page buffers, no pixel copies here
+        crops, owners = [], []      # owner: (page, line id)
+        for p, lines in zip(todo, page_lines):
+            h, w = imgs[p].shape[:2]
+            for line_id, line in enumerate(lines):
+                for x1, y1, x2, y2 in line:
+                    x1, y1 = max(0, x1), max(0, y1)
+                    x2, y2 = min(w, x2), min(h, y2)
+                    if x2 > x1 and y2 > y1:
+                        crops.append(imgs[p][y1:y2, x1:x2])
+                        owners.append((p, line_id))
+
+        with stage("ocr"):
+            regions = self.recognizer.ocr_aksara_batch(crops, return_confidence=True)
+
+        # Regions on the same line are joined with a space
+        line_regions = {p: [[] for _ in lines] for p, lines in zip(todo, page_lines)}
+        for (p, line_id), res in zip(owners, regions):
+            if res["text"]:
+                line_regions[p][line_id].append(res)
+
+        for p in todo:
+            result = []
+            for parts in line_regions[p]:
+                if not parts:
+                    continue
+                chars = [c for res in parts for c in res["char_confidences"]]
+                result.append({
+                    "text": " ".join(res["text"] for res in parts),
+                    "confidence": sum(chars) / len(chars),
+                })
 
-    def _call_model_json(self, content):
-        """Call Gemini + return parsed JSON as dict."""
-        response = self.model.generate_content(content)
-        cleaned = self._clean_json_text(response.text)
-        return self._parse_json(cleaned)
+            if keys[p] is not None:
+                self.ocr_cache.set(keys[p], result)
+            results[p] = result
 
+        return results
+
+    def _select_lines(self, lines: list):
+        """
+        Split OCR lines into text worth translating and lines flagged for review.
+
+        Returns:
+        - (text joined with newlines, list of low-confidence lines)
+        """
+        kept, flagged = [], []
+        for line in lines:
+            if not line["text"]:
+                continue
+            if line["confidence"] < self.min_line_confidence:
+                flagged.append(line)
+            else:
+                kept.append(line["text"])
+
+        return "\n".join(kept).strip(), flagged
+
+    def _translate_lines(self, lines: list, model: str = None) -> dict:
+        """Translate OCR lines; skip Gemini entirely when nothing usable is left."""
+        text, flagged = self._select_lines(lines)
+
+        if text:
+            result = self._translate_document(text, model)
+        else:
+            result = {"aksara": "", "latin": "", "indonesia": ""}
+
+        if flagged:
+            result["low_confidence_lines"] = flagged
+
+        return result
+
+    # ------------------------------------------------------------
+    # Translation
+    # ------------------------------------------------------------
     def _translate_text(self, aksara_text: str, model: str = None) -> dict:
-        """Central translation logic for text."""
-        if model:
-            self.model = genai.GenerativeModel(model)
+        """Central translation logic for one segment of text."""
+        key = None
+        if self.translation_cache is not None:
+            key = self.translation_cache.make_key(
+                aksara_text,
+                self.translator.resolve_model(model),
+                self.translator.prompt_version
+            )
+            cached = self.translation_cache.get(key)
+            if cached is not None:
+                return cached
+
+        with stage("translate.model"):
+            result = self.translator.translate(aksara_text, model)
 
-        prompt = PromptAksaraLontara.prompt_translate_text(aksara_text)
-        return self._call_model_json(prompt)
+        # Do not cache the empty fallback from an unparseable response
+        if key is not None and (result.get("latin") or result.get("indonesia")):
+            self.translation_cache.set(key, result)
+
+        return result
+
+    def _translate_document(self, aksara_text: str, model: str = None) -> dict:
+        """Translate text of any length via the segmenting scheduler."""
+        with stage("translate"):
+            return self.translation_scheduler.translate(aksara_text, model)
+
+    def _translate_documents(self, texts: list, model: str = None) -> list:
+        """Translate several texts at once, sharing the scheduler's pool."""
+        with stage("translate"):
+            return self.translation_scheduler.translate_many(texts, model)
 
     # ------------------------------------------------------------
     # TEXT
     # ------------------------------------------------------------
     def generate_translation_from_text(self, text: str, model: str = None) -> dict:
-        return self._translate_text(text, model)
+        return self._translate_document(text, model)
 
     # ------------------------------------------------------------
     # IMAGE (OCR -> Text -> Gemini)
     # ------------------------------------------------------------
-    def generate_translation_from_image(self, image_path: str, model: str = None) -> dict:
-        aksara_text = self.ocr.ocr_aksara_from_image(image_path)
-        return self._translate_text(aksara_text, model)
+    def generate_translation_from_image(
+        self, image_path: str, model: str = None, detector: str = "none"
+    ) -> dict:
+        lines = self._ocr_image(image_path, detector)
+        return self._translate_lines(lines, model)
+
+    # ------------------------------------------------------------
+    # BULK IMAGES (batched OCR -> deduplicated Gemini calls)
+    # ------------------------------------------------------------
+    def iter_translation_from_images(
+        self, items, model: str = None, detector: str = "none", group: int = None
+    ):
+        """
+        Translate many images, e.g. the members of an uploaded archive.
+        Images are taken `group` (default bulk_batch_size) at a time: they
+        share detection passes and a single recognizer call, and each
+        distinct text is translated once for the whole run.
+
+        items: iterable of (name, image input), consumed lazily, so only
+        one group of decoded images is held at a time. An image given as an
+        Exception (e.g. an unreadable archive member) is reported as failed.
+
+        Yields, in input order:
+        - {"index", "file", "success": True, "result": {...}}
+        - {"index", "file", "success": False, "error": <message>}
+        """
+        group = group or self.bulk_batch_size
+        items = iter(items)
+        translated = {}     # text -> result, reused by later duplicates
+        index = 0
+
+        while True:
+            chunk = list(itertools.islice(items, group))
+            if not chunk:
+                break
+
+            names, images, errors = [], [], {}
+            for offset, (name, image) in enumerate(chunk, start=index):
+                names.append(name)
+                try:
+                    if isinstance(image, Exception):
+                        raise image
+                    images.append((offset, self.ocr.load_image(image)))
+                except Exception as e:
+                    errors[offset] = str(e)
+            del chunk
+
+            pages = self._ocr_pages([img for _, img in images], detector) if images else []
+            selected = {
+                offset: self._select_lines(lines)
+                for (offset, _), lines in zip(images, pages)
+            }
+            del images, pages
+
+            texts = list(dict.fromkeys(
+                text for text, _ in selected.values() if text and text not in translated
+            ))
+            if texts:
+                translated.update(zip(texts, self._translate_documents(texts, model)))
+
+            for offset, name in enumerate(names, start=index):
+                if offset in errors:
+                    yield {"index": offset, "file": name, "success": False, "error": errors[offset]}
+                    continue
+
+                text, flagged = selected[offset]
+                result = dict(translated[text]) if text else {"aksara": "", "latin": "", "indonesia": ""}
+                if flagged:
+                    result["low_confidence_lines"] = flagged
+                yield {"index": offset, "file": name, "success": True, "result": result}
+
+            index += len(names)
 
     # ------------------------------------------------------------
     # PDF (OCR per page -> merge text -> Gemini)
     # ------------------------------------------------------------
-    def generate_translation_from_pdf(self, pdf_path: str, model: str = None) -> dict:
-        pages = list(self._pdf_to_images(pdf_path))
-        if not pages:
-            return {"aksara": "", "latin": "", "indonesia": ""}
+    def _ocr_pdf_pages(
+        self, pdf_path: str, detector: str = "none", window: int = None, start_page: int = 0
+    ):
+        """
+        Yield the OCR lines ({"text", "confidence"}) of each page; each
+        rendered page is freed before the next.
+        """
+        # With a detector, several pages are rendered together so they can
+        # share detection forward passes
+        group = self.detect_batch_size if detector and detector != "none" else 1
+        batches = self._pdf_page_batches(
+            pdf_path, window=window, group=group, start_page=start_page
+        )
+        while True:
+            with stage("render"):
+                arrays = next(batches, None)
+            if arrays is None:
+                break
+
+            # Pages go to OCR as raw HWC arrays, no PNG round trip
+            pages = self._ocr_pages(arrays, detector)
 
-        ocr_results = []
+            # Drop the page views before the next batch frees their memory
+            del arrays
+            yield from pages
 
-        for img in pages:
-            # Convert PIL image → bytes (PNG) for OCR if needed
-            buf = BytesIO()
-            img.save(buf, format="PNG")
-            buf.seek(0)
+    def generate_translation_from_pdf(
+        self, pdf_path: str, model: str = None, detector: str = "none"
+    ) -> dict:
+        lines = [line for page in self._ocr_pdf_pages(pdf_path, detector) for line in page]
+        return self._translate_lines(lines, model)
 
-            # OCR expects file path OR ndarray — we use ndarray via numpy array
-            np_img = Image.open(buf)
-            text = self.ocr.ocr_aksara_from_image(np_img)
-            ocr_results.append(text)
+    def iter_translation_from_pdf(
+        self, pdf_path: str, model: str = None, detector: str = "none", window: int = None,
+        start_page: int = 0
+    ):
+        """
+        Stream per-page results: render, recognize and translate one page
+        (or a small window of pages) at a time. Blank pages skip Gemini.
+        start_page (0-based) resumes a document after its first pages.
 
-        combined_text = "\n".join(ocr_results).strip()
-        return self._translate_text(combined_text, model)
\ No newline at end of file
+        Yields:
+        - {"page": <1-based>, "aksara": ..., "latin": ..., "indonesia": ...}
+        """
+        pages = self._ocr_pdf_pages(pdf_path, detector, window, start_page)
+        for i, lines in enumerate(pages, start=start_page):
+            yield {"page": i + 1, **self._translate_lines(lines, model)}
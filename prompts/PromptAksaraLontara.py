@@ -1,7 +1,42 @@
 class PromptAksaraLontara:
 
+    # Bump whenever a prompt's wording changes, so cached translations
+    # produced with the old wording are not reused.
+    PROMPT_VERSION = "2"
+
+    CONSONANTS = [
+        ("ᨀ", "ka"), ("ᨁ", "ga"), ("ᨂ", "nga"), ("ᨃ", "pa"), ("ᨄ", "ba"), ("ᨅ", "ma"),
+        ("ᨆ", "ta"), ("ᨇ", "da"), ("ᨈ", "na"), ("ᨉ", "ca"), ("ᨊ", "ja"), ("ᨋ", "nya"),
+        ("ᨌ", "ya"), ("ᨍ", "ra"), ("ᨎ", "la"), ("ᨏ", "wa"), ("ᨐ", "sa"), ("ᨑ", "a"),
+        ("ᨒ", "ha"), ("ᨓ", "fa"), ("ᨔ", "kha"), ("ᨕ", "sya"), ("ᨖ", "za"),
+    ]
+
+    VOWEL_DIACRITICS = [
+        ("ᨗ", "i"), ("ᨘ", "u"), ("ᨙ", "e/ə"), ("ᨚ", "o"), ("ᨛ", "é"),
+    ]
+
     @staticmethod
-    def prompt_translate_text(text: str) -> str:
+    def character_table() -> str:
+        """Lontara character table shared by the prompts."""
+        consonants = [f"{char} ({latin})" for char, latin in PromptAksaraLontara.CONSONANTS]
+        rows = [", ".join(consonants[i:i + 6]) for i in range(0, len(consonants), 6)]
+        vowels = ", ".join(f"{char} ({latin})" for char, latin in PromptAksaraLontara.VOWEL_DIACRITICS)
+
+        return (
+            f"Base consonants ({len(consonants)}):\n"
+            + ",\n".join(rows)
+            + f"\n\nVowel diacritics:\n{vowels}\n\n"
+        )
+
+    @staticmethod
+    def system_instruction_translate_text() -> str:
+        """
+        Static part of the text prompt: role, character table, rules.
+        Identical for every request, so it is built once
+        (SYSTEM_INSTRUCTION_TRANSLATE_TEXT) and sent as a system
+        instruction that the provider can cache.
+        """
+        character_table = PromptAksaraLontara.character_table()
         return f"""
 You are an expert linguist transliterator and translator specializing in Aksara Lontara Bugis-Makassar. The input will already be valid Lontara text (OCR is done beforehand). Your job is only:
 
@@ -15,16 +50,7 @@ Always perform “dictionary-first reconstruction”. If the literal translitera
 
 Lontara Characters:
 
-Base consonants (23):
-ᨀ (ka), ᨁ (ga), ᨂ (nga), ᨃ (pa), ᨄ (ba), ᨅ (ma),
-ᨆ (ta), ᨇ (da), ᨈ (na), ᨉ (ca), ᨊ (ja), ᨋ (nya),
-ᨌ (ya), ᨍ (ra), ᨎ (la), ᨏ (wa), ᨐ (sa), ᨑ (a),
-ᨒ (ha), ᨓ (fa), ᨔ (kha), ᨕ (sya), ᨖ (za)
-
-Vowel diacritics:
-ᨗ (i), ᨘ (u), ᨙ (e/ə), ᨚ (o), ᨛ (é)
-
-Rules for diacritics:
+{character_table}Rules for diacritics:
 - Default vowel is “a” if no diacritic is present.
 - Examples:
   ᨀ + ᨗ = ki
@@ -50,7 +76,12 @@ If something is unrecognized, return "".
 Output Rules:
 Always respond ONLY with valid JSON. No commentary or markdown. If any part cannot be determined, return "".
 
-Input Lontara text: 
+"""
+
+    @staticmethod
+    def prompt_translate_text_suffix(text: str) -> str:
+        """Per-request part of the text prompt: the input and output template."""
+        return f"""Input Lontara text: 
 {text}
 
 Output JSON format:
@@ -61,6 +92,14 @@ Output JSON format:
 }}
 """
 
+    @staticmethod
+    def prompt_translate_text(text: str) -> str:
+        """Full text prompt (system instruction + suffix) as a single string."""
+        return (
+            PromptAksaraLontara.SYSTEM_INSTRUCTION_TRANSLATE_TEXT
+            + PromptAksaraLontara.prompt_translate_text_suffix(text)
+        )
+
     @staticmethod
     def prompt_translate_image() -> str:
         return """
@@ -171,4 +210,10 @@ Output JSON format:
   "latin": "<hasil_transliterasi_latin>",
   "indonesia": "<hasil_terjemahan_bahasa_indonesia>"
 }
-"""
\ No newline at end of file
+"""
+
+
+# Built once at import; every request reuses the same string
+PromptAksaraLontara.SYSTEM_INSTRUCTION_TRANSLATE_TEXT = (
+    PromptAksaraLontara.system_instruction_translate_text()
+)
@@ -1,7 +1,19 @@
+import sys
+
 from ocr.OcrAksaraLontara import OcrAksaraLontara
+from bench.synthetic import load_charset, render_line
+
+ocr = OcrAksaraLontara(
+    onnx_model_path="dir_ocr_models/PP-OCRv5_server_rec_infer/buginese_ocr_model.onnx",
+    dict_path="dir_ocr_models/PP-OCRv5_server_rec_infer/lontara_chr.txt",
+)
 
-ocr = OcrAksaraLontara()
+# python test_ocr.py [line_image]; without an image, OCR a synthetic line
+if len(sys.argv) > 1:
+    image = sys.argv[1]
+else:
+    image = render_line("".join(load_charset()[:12]))
 
-ocr_output = ocr.ocr_aksara_from_image("dir_pdf\sample_lontara_1.pdf")
+ocr_output = ocr.ocr_aksara_from_image(image)
 
-print("ocr output:", ocr_output)
\ No newline at end of file
+print("ocr output:", ocr_output)
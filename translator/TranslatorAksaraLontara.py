@@ -0,0 +1,43 @@
+# Translation backends selectable by configuration ("gemini" or "local")
+TRANSLATORS = ("gemini", "local")
+
+
+class TranslatorAksaraLontara:
+    """
+    Interface for Lontara translation backends.
+
+    translate() takes one segment of aksara text and returns
+    {"aksara", "latin", "indonesia"}. model_name/prompt_version identify
+    the output for the translation cache.
+    """
+
+    prompt_version = "1"
+
+    def __init__(self, model_name: str):
+        self.model_name = model_name
+
+    def resolve_model(self, model: str = None) -> str:
+        """Model name actually used for a request (cache key component)."""
+        return model or self.model_name
+
+    def translate(self, aksara_text: str, model: str = None) -> dict:
+        raise NotImplementedError
+
+    def stats(self) -> dict:
+        return {}
+
+
+def create_translator(backend: str = "gemini", **kwargs) -> TranslatorAksaraLontara:
+    """
+    Build a translation backend. Backend modules are imported here, so
+    the local backend never loads google-generativeai or needs an API key.
+    """
+    if backend == "gemini":
+        from translator.TranslatorAksaraLontaraGemini import GeminiTranslatorAksaraLontara
+        return GeminiTranslatorAksaraLontara(**kwargs)
+
+    if backend == "local":
+        from translator.TranslatorAksaraLontaraLocal import LocalTranslatorAksaraLontara
+        return LocalTranslatorAksaraLontara(**kwargs)
+
+    raise ValueError(f"Unknown translator '{backend}', expected one of {TRANSLATORS}.")
@@ -0,0 +1,143 @@
+import os
+import json
+import time
+import logging
+import threading
+from datetime import timedelta
+
+import google.generativeai as genai
+from google.generativeai import caching
+
+from prompts.PromptAksaraLontara import PromptAksaraLontara
+from translator.TranslatorAksaraLontara import TranslatorAksaraLontara
+from utils.TokenUsage import TokenUsage
+
+logger = logging.getLogger(__name__)
+
+
+class GeminiTranslatorAksaraLontara(TranslatorAksaraLontara):
+    """
+    Gemini backend.
+
+    The static prompt prefix is sent as a system instruction. With
+    context_cache_ttl > 0 it is also stored in Gemini's context cache
+    (or in whatever context_cache_factory returns, e.g. a local stand-in),
+    so each request only sends the short suffix.
+    """
+
+    prompt_version = PromptAksaraLontara.PROMPT_VERSION
+
+    def __init__(
+        self,
+        model_name: str = "gemini-2.5-flash",
+        api_key: str = None,
+        context_cache_ttl: int = 0,
+        context_cache_factory=None,
+    ):
+        super().__init__(model_name)
+
+        api_key = api_key or os.getenv("GEMINI_API_KEY")
+        if not api_key:
+            raise RuntimeError("Missing GEMINI_API_KEY in environment variables.")
+
+        genai.configure(api_key=api_key)
+
+        self.context_cache_ttl = context_cache_ttl
+        self.context_cache_factory = context_cache_factory or self._create_cached_model
+        self._models = {}            # name -> (GenerativeModel, expires_at or None)
+        self._models_lock = threading.Lock()
+        self.token_usage = TokenUsage()
+
+        self.model = self._get_model(model_name)[1]
+
+    # ------------------------------------------------------------
+    # Utils
+    # ------------------------------------------------------------
+    @staticmethod
+    def _clean_json_text(text: str) -> str:
+        """
+        Remove markdown fences and ensure JSON only.
+        """
+        text = text.strip()
+
+        # Remove markdown fences ```json ... ```
+        if text.startswith("```"):
+            lines = text.split("\n")
+            lines = [line for line in lines if not line.startswith("```")]
+            text = "\n".join(lines).strip()
+
+        return text
+
+    @staticmethod
+    def _parse_json(text: str) -> dict:
+        """
+        Convert cleaned JSON string into dict safely.
+        """
+        try:
+            return json.loads(text)
+        except Exception:
+            # Fallback to empty JSON-safe structure
+            return {"aksara": "", "latin": "", "indonesia": ""}
+
+    # ------------------------------------------------------------
+    # Models
+    # ------------------------------------------------------------
+    @staticmethod
+    def _create_cached_model(model_name: str, system_instruction: str, ttl_seconds: int):
+        """Store the system instruction in Gemini's context cache and bind a model to it."""
+        cached = caching.CachedContent.create(
+            model=model_name,
+            display_name=f"aksara-lontara-v{PromptAksaraLontara.PROMPT_VERSION}",
+            system_instruction=system_instruction,
+            ttl=timedelta(seconds=ttl_seconds),
+        )
+        return genai.GenerativeModel.from_cached_content(cached_content=cached)
+
+    def _get_model(self, model: str = None):
+        """GenerativeModel for a model name, created once and reused until its cache expires."""
+        name = self.resolve_model(model)
+
+        with self._models_lock:
+            entry = self._models.get(name)
+            if entry is not None and (entry[1] is None or entry[1] > time.time()):
+                return name, entry[0]
+
+            instruction = PromptAksaraLontara.SYSTEM_INSTRUCTION_TRANSLATE_TEXT
+            generative_model, expires_at = None, None
+
+            if self.context_cache_ttl > 0:
+                try:
+                    generative_model = self.context_cache_factory(
+                        name, instruction, self.context_cache_ttl
+                    )
+                    # Refresh a little before the provider drops the cache
+                    expires_at = time.time() + self.context_cache_ttl * 0.9
+                except Exception as e:
+                    # e.g. prefix below the model's minimum cacheable size
+                    logger.warning("Context caching unavailable for %s: %s", name, e)
+
+            if generative_model is None:
+                generative_model = genai.GenerativeModel(name, system_instruction=instruction)
+
+            self._models[name] = (generative_model, expires_at)
+            return name, generative_model
+
+    # ------------------------------------------------------------
+    # Translate
+    # ------------------------------------------------------------
+    def _call_model_json(self, content, model=None):
+        """Call Gemini + return parsed JSON as dict."""
+        response = (model or self.model).generate_content(content)
+        self.token_usage.record(getattr(response, "usage_metadata", None))
+        cleaned = self._clean_json_text(response.text)
+        return self._parse_json(cleaned)
+
+    def translate(self, aksara_text: str, model: str = None) -> dict:
+        _, generative_model = self._get_model(model)
+
+        # Static instructions live in the model's system instruction
+        prompt = PromptAksaraLontara.prompt_translate_text_suffix(aksara_text)
+        return self._call_model_json(prompt, generative_model)
+
+    def stats(self) -> dict:
+        return {"tokens": self.token_usage.stats()}
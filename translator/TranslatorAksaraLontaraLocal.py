@@ -0,0 +1,97 @@
+import re
+import logging
+import unicodedata
+
+from translator.TranslatorAksaraLontara import TranslatorAksaraLontara
+
+logger = logging.getLogger(__name__)
+
+# Buginese block (U+1A00-U+1A1F). Syllables follow the Unicode character
+# names ("BUGINESE LETTER NGKA" -> "ngka"), except where the usual Latin
+# spelling differs from the name.
+BUGINESE_BLOCK = range(0x1A00, 0x1A20)
+LETTER_SPELLING = {"NYCA": "nca", "VA": "wa"}
+VOWEL_SPELLING = {"AE": "é"}
+
+# Lontara punctuation: pallawa and end-of-section
+PUNCTUATION = {"᨞": ",", "᨟": "."}
+
+# Spot checks of the derived table (see __init__)
+KNOWN_SYLLABLES = {
+    "ᨀ": "ka", "ᨃ": "ngka", "ᨊ": "na", "ᨌ": "ca", "ᨍ": "ja",
+    "ᨒ": "la", "ᨕ": "a", "ᨖ": "ha", "ᨊᨚ": "no", "ᨀᨗ": "ki",
+}
+
+
+def buginese_characters() -> tuple:
+    """Consonants and vowel signs of the Buginese block, each mapped to Latin."""
+    consonants, vowels = {}, {}
+    for code in BUGINESE_BLOCK:
+        name = unicodedata.name(chr(code), "")
+        if name.startswith("BUGINESE LETTER "):
+            letter = name[len("BUGINESE LETTER "):]
+            consonants[chr(code)] = LETTER_SPELLING.get(letter, letter.lower())
+        elif name.startswith("BUGINESE VOWEL SIGN "):
+            sign = name[len("BUGINESE VOWEL SIGN "):]
+            vowels[chr(code)] = VOWEL_SPELLING.get(sign, sign.lower())
+    return consonants, vowels
+
+
+class LocalTranslatorAksaraLontara(TranslatorAksaraLontara):
+    """
+    Deterministic offline backend: rule-based Lontara -> Latin
+    transliteration, with syllables derived from the Unicode names of the
+    Buginese block.
+
+    It does no dictionary reconstruction and no Indonesian translation
+    ("indonesia" is always ""). It is meant for offline use, tests and
+    load tests of the rest of the pipeline.
+    """
+
+    prompt_version = "local-2"
+
+    def __init__(self, model_name: str = "local-transliterator", dict_path: str = None):
+        super().__init__(model_name)
+
+        consonants, vowels = buginese_characters()
+
+        if dict_path:
+            with open(dict_path, "r", encoding="utf-8") as f:
+                recognizable = {line.strip() for line in f if line.strip()}
+            unmapped = recognizable - set(consonants) - set(vowels)
+            if unmapped:
+                logger.warning("No transliteration for OCR characters: %s", sorted(unmapped))
+
+        # Precompute every consonant (+ optional vowel) syllable once
+        self._syllables = dict(PUNCTUATION)
+        for char, latin in consonants.items():
+            self._syllables[char] = latin
+            for vowel, vowel_latin in vowels.items():
+                # Replace the inherent "a" with the diacritic's vowel
+                self._syllables[char + vowel] = latin[:-1] + vowel_latin
+        for vowel, vowel_latin in vowels.items():
+            # Diacritic without a base consonant
+            self._syllables.setdefault(vowel, vowel_latin)
+
+        wrong = {
+            chars: self._syllables.get(chars)
+            for chars, latin in KNOWN_SYLLABLES.items()
+            if self._syllables.get(chars) != latin
+        }
+        if wrong:
+            raise RuntimeError(f"Lontara transliteration table is wrong for: {wrong}")
+
+        chars = "".join(re.escape(c) for c in consonants)
+        marks = "".join(re.escape(v) for v in vowels)
+        punct = "".join(re.escape(p) for p in PUNCTUATION)
+        self._pattern = re.compile(f"[{chars}][{marks}]?|[{marks}]|[{punct}]")
+
+    def transliterate(self, aksara_text: str) -> str:
+        return self._pattern.sub(lambda m: self._syllables[m.group(0)], aksara_text)
+
+    def translate(self, aksara_text: str, model: str = None) -> dict:
+        return {
+            "aksara": aksara_text,
+            "latin": self.transliterate(aksara_text),
+            "indonesia": "",
+        }
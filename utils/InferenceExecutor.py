@@ -0,0 +1,180 @@
+import time
+import asyncio
+import threading
+import contextvars
+import multiprocessing
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+from utils.Metrics import observe_stage
+
+
+class ExecutorBusyError(RuntimeError):
+    """Raised when the executor queue is full and the request is rejected."""
+
+    def __init__(self, message: str, status_code: int = 503, retry_after: int = 1):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+class InferenceExecutor:
+    """
+    Bounded executor layer for blocking work (ONNX, Gemini, pdfium).
+
+    - thread_pool: runs synchronous processor calls off the event loop
+    - process_pool: optional pool for PDF rasterization
+    - backpressure: at most max_workers jobs run and max_queue wait;
+      anything beyond that is rejected with ExecutorBusyError
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 4,
+        max_queue: int = 16,
+        pdf_processes: int = 0,
+        busy_status_code: int = 503,
+    ):
+        if max_workers < 1:
+            raise ValueError("max_workers must be >= 1")
+
+        self.max_workers = max_workers
+        self.max_queue = max(0, max_queue)
+        self.busy_status_code = busy_status_code
+
+        self.thread_pool = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="aksara-infer"
+        )
+
+        # spawn: forking a process that already runs ONNX Runtime threads is unsafe
+        self.process_pool = None
+        if pdf_processes > 0:
+            self.process_pool = ProcessPoolExecutor(
+                max_workers=pdf_processes,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+
+        self._lock = threading.Lock()
+        self._pending = 0
+
+    # ------------------------------------------------------------
+    # State
+    # ------------------------------------------------------------
+    @property
+    def in_flight(self) -> int:
+        """Jobs currently running on the thread pool."""
+        return min(self._pending, self.max_workers)
+
+    @property
+    def queued(self) -> int:
+        """Jobs accepted but still waiting for a free worker."""
+        return max(0, self._pending - self.max_workers)
+
+    def _acquire(self):
+        with self._lock:
+            if self._pending >= self.max_workers + self.max_queue:
+                raise ExecutorBusyError(
+                    f"Server busy: {self._pending} requests in progress, try again later.",
+                    status_code=self.busy_status_code,
+                )
+            self._pending += 1
+
+    def _release(self):
+        with self._lock:
+            self._pending -= 1
+
+    # ------------------------------------------------------------
+    # Run
+    # ------------------------------------------------------------
+    async def run(self, fn, *args, **kwargs):
+        """Run a blocking callable on the thread pool and await its result."""
+        self._acquire()
+        try:
+            future = self._submit(fn, *args, **kwargs)
+        except Exception:
+            self._release()
+            raise
+
+        # Release when the work actually finishes, not when the caller
+        # stops waiting (e.g. a client disconnect cancels the await).
+        future.add_done_callback(lambda _: self._release())
+        return await asyncio.wrap_future(future)
+
+    def reserve(self) -> "ExecutorReservation":
+        """
+        Admit a long-lived caller (e.g. a streamed response) once, up front.
+
+        Raises ExecutorBusyError like run(); otherwise the caller holds one
+        slot until it calls release() and runs all of its work through the
+        reservation without further admission checks.
+        """
+        self._acquire()
+        return ExecutorReservation(self)
+
+    def _submit(self, fn, *args, **kwargs):
+        # Carry the caller's context (e.g. a per-request timing trace)
+        ctx = contextvars.copy_context()
+        return self.thread_pool.submit(
+            ctx.run, self._timed, time.perf_counter(), partial(fn, *args, **kwargs)
+        )
+
+    @staticmethod
+    def _timed(submitted: float, fn):
+        observe_stage("queue_wait", time.perf_counter() - submitted)
+        return fn()
+
+    def shutdown(self):
+        self.thread_pool.shutdown(wait=False, cancel_futures=True)
+        if self.process_pool is not None:
+            self.process_pool.shutdown(wait=False, cancel_futures=True)
+
+
+class ExecutorReservation:
+    """
+    One admitted slot of an InferenceExecutor (see reserve()).
+
+    The slot is given back once release() was called and the last call
+    run through it has finished, so work still running for a caller that
+    went away keeps counting against the limit.
+    """
+
+    def __init__(self, executor: InferenceExecutor):
+        self.executor = executor
+        self._lock = threading.Lock()
+        self._running = 0
+        self._released = False
+        self._returned = False
+
+    async def run(self, fn, *args, **kwargs):
+        """Like InferenceExecutor.run, without the busy check."""
+        with self._lock:
+            if self._released:
+                raise RuntimeError("Executor reservation already released.")
+            self._running += 1
+        try:
+            future = self.executor._submit(fn, *args, **kwargs)
+        except Exception:
+            self._done()
+            raise
+
+        future.add_done_callback(lambda _: self._done())
+        return await asyncio.wrap_future(future)
+
+    def release(self):
+        """Give the slot back (idempotent)."""
+        with self._lock:
+            self._released = True
+        self._maybe_return()
+
+    def _done(self):
+        with self._lock:
+            self._running -= 1
+        self._maybe_return()
+
+    def _maybe_return(self):
+        with self._lock:
+            if not self._released or self._running or self._returned:
+                return
+            self._returned = True
+        self.executor._release()
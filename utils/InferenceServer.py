@@ -0,0 +1,371 @@
+"""
+Local inference server: one process owns the models, HTTP workers share it.
+
+Every uvicorn worker would otherwise load its own ONNX recognizer and
+detectors. In this mode a single server process loads them once and
+serves recognition and detection over a Unix domain socket; workers use
+InferenceClient, which exposes the recognizer methods the processor
+calls, in place of a local OcrAksaraLontara.
+
+Pixels never travel over the socket: the client packs a request's images
+into one shared memory block and sends only its name, offsets and shapes.
+The server recognizes straight from views over that block. Requests from
+all workers meet in the server, where the micro-batching scheduler
+(--batch-max-latency-ms) coalesces them.
+
+Usage:
+    python -m utils.InferenceServer --socket /tmp/aksara-infer.sock
+    AKSARA_INFERENCE_SOCKET=/tmp/aksara-infer.sock uvicorn app:app --workers 4
+"""
+import os
+import json
+import struct
+import signal
+import socket
+import argparse
+import threading
+import socketserver
+from multiprocessing import shared_memory, resource_tracker
+
+import numpy as np
+
+_HEADER = struct.Struct("!I")
+
+
+# ------------------------------------------------------------
+# Framing: 4-byte length + JSON body
+# ------------------------------------------------------------
+def _send(sock, message: dict):
+    body = json.dumps(message, ensure_ascii=False).encode("utf-8")
+    sock.sendall(_HEADER.pack(len(body)) + body)
+
+
+def _recv_exact(sock, n: int) -> bytes:
+    buf = bytearray()
+    while len(buf) < n:
+        chunk = sock.recv(n - len(buf))
+        if not chunk:
+            raise ConnectionError("Inference server connection closed.")
+        buf += chunk
+    return bytes(buf)
+
+
+def _recv(sock) -> dict:
+    (size,) = _HEADER.unpack(_recv_exact(sock, _HEADER.size))
+    return json.loads(_recv_exact(sock, size).decode("utf-8"))
+
+
+# ------------------------------------------------------------
+# Server
+# ------------------------------------------------------------
+class _Handler(socketserver.BaseRequestHandler):
+
+    def handle(self):
+        while True:
+            try:
+                request = _recv(self.request)
+            except ConnectionError:
+                return
+
+            try:
+                reply = {"result": self.server.dispatch(request)}
+            except Exception as e:
+                reply = {"error": f"{type(e).__name__}: {e}"}
+            _send(self.request, reply)
+
+
+class InferenceServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """
+    Serve a ProcessorAksaraLontara's recognizer and detectors on a socket.
+
+    Ops:
+    - ocr: images -> [{"text", "confidence", "char_confidences"}]
+    - ocr_exact: images -> [text], each recognized alone at its exact width
+    - warmup: one uncached dummy inference per width bucket
+    - detect: images + detector -> per image, lines of xyxy boxes in reading order
+    - info: cache params and bucket layout of the loaded recognizer
+    - stats: per-bucket throughput and micro-batching stats
+    """
+
+    daemon_threads = True
+
+    def __init__(self, socket_path: str, processor):
+        self.socket_path = socket_path
+        self.processor = processor
+
+        if os.path.exists(socket_path):
+            os.remove(socket_path)
+        super().__init__(socket_path, _Handler)
+
+    def dispatch(self, request: dict):
+        op = request.get("op")
+
+        if op == "ocr":
+            with _attach(request) as images:
+                return self.processor.recognizer.ocr_aksara_batch(
+                    images, return_confidence=True, pad_to_buckets=request.get("pad_to_buckets")
+                )
+
+        if op == "ocr_exact":
+            with _attach(request) as images:
+                return [self.processor.ocr.ocr_aksara_from_array(img) for img in images]
+
+        if op == "warmup":
+            self.processor.ocr.warmup()
+            return None
+
+        if op == "detect":
+            with _attach(request) as images:
+                pages = self.processor._detect_lines_batch(images, request["detector"])
+            return [
+                [[[int(v) for v in box] for box in line] for line in lines]
+                for lines in pages
+            ]
+
+        if op == "info":
+            ocr = self.processor.ocr
+            return {
+                "cache_params": ocr.cache_params(),
+                "img_height": ocr.img_height,
+                "max_width": ocr.max_width,
+                "width_buckets": ocr.width_buckets,
+            }
+
+        if op == "stats":
+            batcher = self.processor.ocr_batcher
+            return {
+                "buckets": self.processor.ocr.batch_throughput(),
+                "scheduler": batcher.stats() if batcher is not None else None,
+            }
+
+        raise ValueError(f"Unknown op '{op}'.")
+
+    def server_close(self):
+        super().server_close()
+        if self.processor.ocr_batcher is not None:
+            self.processor.ocr_batcher.close()
+        if os.path.exists(self.socket_path):
+            os.remove(self.socket_path)
+
+
+class _attach:
+    """Map the client's shared memory block and yield HWC views into it."""
+
+    def __init__(self, request: dict):
+        self.request = request
+        self.shm = None
+
+    def __enter__(self):
+        self.shm = shared_memory.SharedMemory(name=self.request["shm"])
+        # The client owns (and unlinks) the block
+        resource_tracker.unregister(self.shm._name, "shared_memory")
+        return [
+            np.ndarray(tuple(shape), dtype=np.uint8, buffer=self.shm.buf, offset=offset)
+            for offset, shape in self.request["images"]
+        ]
+
+    def __exit__(self, *exc):
+        try:
+            self.shm.close()
+        except BufferError:
+            # A view is still referenced; the mapping goes with it
+            pass
+        return False
+
+
+# ------------------------------------------------------------
+# Client
+# ------------------------------------------------------------
+class InferenceClient:
+    """
+    Stand-in for OcrAksaraLontara that forwards work to an InferenceServer.
+
+    Each thread keeps its own connection. Images are copied once, into a
+    shared memory block that the server reads in place.
+    """
+
+    # Crop-level caching happens in the server process
+    cache = None
+
+    def __init__(self, socket_path: str, timeout: float = 120.0):
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self._local = threading.local()
+        self._info = None
+
+    def _connection(self):
+        sock = getattr(self._local, "sock", None)
+        if sock is None:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(self.timeout)
+            sock.connect(self.socket_path)
+            self._local.sock = sock
+        return sock
+
+    def _call(self, message: dict):
+        sock = self._connection()
+        try:
+            _send(sock, message)
+            reply = _recv(sock)
+        except (OSError, ConnectionError):
+            # Drop the broken connection so the next call reconnects
+            self._local.sock = None
+            sock.close()
+            raise
+
+        if "error" in reply:
+            raise RuntimeError(f"Inference server: {reply['error']}")
+        return reply["result"]
+
+    def _call_with_images(self, message: dict, images):
+        arrays = [np.ascontiguousarray(self.load_image(image)) for image in images]
+
+        offsets, total = [], 0
+        for arr in arrays:
+            offsets.append(total)
+            total += arr.nbytes
+
+        shm = shared_memory.SharedMemory(create=True, size=max(1, total))
+        try:
+            for offset, arr in zip(offsets, arrays):
+                np.ndarray(arr.shape, dtype=np.uint8, buffer=shm.buf, offset=offset)[...] = arr
+            message = dict(
+                message,
+                shm=shm.name,
+                images=[[offset, list(arr.shape)] for offset, arr in zip(offsets, arrays)],
+            )
+            return self._call(message)
+        finally:
+            shm.close()
+            shm.unlink()
+
+    # ------------------------------------------------------------
+    # Recognizer interface
+    # ------------------------------------------------------------
+    @staticmethod
+    def load_image(image_input):
+        from ocr.OcrAksaraLontara import OcrAksaraLontara
+        return OcrAksaraLontara.load_image(image_input)
+
+    def ocr_aksara_batch(self, images, return_confidence: bool = False, pad_to_buckets: bool = None):
+        if len(images) == 0:
+            return []
+
+        results = self._call_with_images({"op": "ocr", "pad_to_buckets": pad_to_buckets}, images)
+        if return_confidence:
+            return results
+        return [res["text"] for res in results]
+
+    def ocr_aksara_from_image(self, image_input):
+        return self._call_with_images({"op": "ocr_exact"}, [image_input])[0]
+
+    def warmup(self):
+        self._call({"op": "warmup"})
+
+    def detect_lines_batch(self, images, detector: str) -> list:
+        if len(images) == 0:
+            return []
+        return self._call_with_images({"op": "detect", "detector": detector}, images)
+
+    def detect_lines(self, image, detector: str) -> list:
+        return self.detect_lines_batch([image], detector)[0]
+
+    @property
+    def info(self) -> dict:
+        if self._info is None:
+            self._info = self._call({"op": "info"})
+        return self._info
+
+    def cache_params(self) -> dict:
+        params = dict(self.info["cache_params"])
+        params["width_buckets"] = tuple(params["width_buckets"])
+        return params
+
+    @property
+    def img_height(self) -> int:
+        return self.info["img_height"]
+
+    @property
+    def width_buckets(self) -> list:
+        return self.info["width_buckets"]
+
+    def batch_throughput(self) -> dict:
+        return self._call({"op": "stats"})["buckets"]
+
+    def stats(self) -> dict:
+        return self._call({"op": "stats"})
+
+
+# ------------------------------------------------------------
+# Entry point
+# ------------------------------------------------------------
+def main():
+    from processor.ProcessorAksaraLontara import ProcessorAksaraLontara
+    from utils.OcrResultCache import OcrResultCache
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--socket", default=os.getenv("AKSARA_INFERENCE_SOCKET", "/tmp/aksara-infer.sock"))
+    parser.add_argument("--ocr-model", default=os.getenv(
+        "AKSARA_OCR_MODEL_PATH",
+        "dir_ocr_models/PP-OCRv5_server_rec_infer/buginese_ocr_model.onnx"
+    ))
+    parser.add_argument("--ocr-dict", default="dir_ocr_models/PP-OCRv5_server_rec_infer/lontara_chr.txt")
+    parser.add_argument("--profile", default=os.getenv("AKSARA_ORT_PROFILE", "throughput"))
+    parser.add_argument("--tile-long-lines", action="store_true",
+                        default=os.getenv("AKSARA_OCR_TILE_LONG_LINES", "0").lower() in ("1", "true", "yes"))
+    parser.add_argument("--tile-overlap", type=int, default=int(os.getenv("AKSARA_OCR_TILE_OVERLAP", "48")))
+    parser.add_argument("--max-tiles", type=int, default=int(os.getenv("AKSARA_OCR_MAX_TILES", "32")))
+    parser.add_argument("--pad-to-buckets", action="store_true",
+                        default=os.getenv("AKSARA_OCR_PAD_TO_BUCKETS", "0").lower() in ("1", "true", "yes"),
+                        help="pad crops to width buckets (larger batches, but results can differ)")
+    parser.add_argument("--yolo-model", default=os.getenv("YOLO_MODEL_PATH"))
+    parser.add_argument("--det-model-dir", default=os.getenv("DET_MODEL_DIR"))
+    parser.add_argument("--detect-batch-size", type=int,
+                        default=int(os.getenv("AKSARA_DETECT_BATCH_SIZE", "4")))
+    parser.add_argument("--detect-prepass-size", type=int,
+                        default=int(os.getenv("AKSARA_DETECT_PREPASS_SIZE", "0")) or None)
+    parser.add_argument("--batch-max-latency-ms", type=float,
+                        default=float(os.getenv("AKSARA_BATCH_MAX_LATENCY_MS", "5")))
+    parser.add_argument("--batch-max-size", type=int,
+                        default=int(os.getenv("AKSARA_BATCH_MAX_SIZE", "32")))
+    parser.add_argument("--ocr-cache-bytes", type=int,
+                        default=int(os.getenv("AKSARA_OCR_CACHE_BYTES", str(64 * 1024 * 1024))))
+    args = parser.parse_args()
+
+    processor = ProcessorAksaraLontara(
+        ocr_model_path=args.ocr_model,
+        ocr_dict_path=args.ocr_dict,
+        ocr_session_profile=args.profile,
+        ocr_tile_long_lines=args.tile_long_lines,
+        ocr_tile_overlap=args.tile_overlap,
+        ocr_max_tiles=args.max_tiles,
+        ocr_pad_to_buckets=args.pad_to_buckets,
+        yolo_model_path=args.yolo_model,
+        det_model_dir=args.det_model_dir,
+        detect_batch_size=args.detect_batch_size,
+        detect_prepass_size=args.detect_prepass_size,
+        ocr_cache=OcrResultCache(max_bytes=args.ocr_cache_bytes) if args.ocr_cache_bytes else None,
+        batch_max_latency_ms=args.batch_max_latency_ms,
+        batch_max_size=args.batch_max_size,
+        translator_backend="local",
+    )
+    # Load the models before accepting connections
+    processor.ocr
+
+    server = InferenceServer(args.socket, processor)
+    # shutdown() blocks until serve_forever returns, so call it off the main thread
+    signal.signal(
+        signal.SIGTERM,
+        lambda signum, frame: threading.Thread(target=server.shutdown).start()
+    )
+    print(f"Aksara inference server listening on {args.socket}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,323 @@
+import json
+import time
+import uuid
+import sqlite3
+import threading
+
+
+JOB_STATUSES = ("queued", "running", "done", "failed", "cancelled")
+FINISHED = ("done", "failed", "cancelled")
+
+
+class JobCancelled(Exception):
+    """Raised inside a handler when its job was cancelled."""
+
+
+class JobLeaseLost(Exception):
+    """Raised inside a handler whose job was reclaimed by another worker."""
+
+
+class JobStore:
+    """
+    SQLite-backed job records and per-page checkpoints.
+
+    - jobs: one row per job (status, params, progress, final result)
+    - job_pages: one row per finished page, written as soon as the page
+      is done, so a restarted job resumes after its last checkpoint and
+      partial results can be read while it runs
+
+    Running jobs hold a lease (heartbeat_at), renewed by the worker while
+    the job runs; a job whose lease expired (its process died) is claimed
+    again by the next worker, in this or any other process. Every claim
+    gets a new owner token, and progress is only recorded for the current
+    owner, so a worker that lost its lease cannot write over the new one.
+    """
+
+    def __init__(self, db_path: str, lease_seconds: float = 300):
+        self.db_path = db_path
+        self.lease_seconds = lease_seconds
+        self._lock = threading.Lock()
+
+        # Autocommit; claims use explicit BEGIN IMMEDIATE transactions
+        self._db = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            "id TEXT PRIMARY KEY, kind TEXT NOT NULL, status TEXT NOT NULL, "
+            "params TEXT NOT NULL, pages_total INTEGER, pages_done INTEGER NOT NULL DEFAULT 0, "
+            "result TEXT, error TEXT, created_at REAL NOT NULL, updated_at REAL NOT NULL, "
+            "heartbeat_at REAL, owner TEXT)"
+        )
+        # Databases created before claims carried an owner token
+        columns = [row[1] for row in self._db.execute("PRAGMA table_info(jobs)")]
+        if "owner" not in columns:
+            self._db.execute("ALTER TABLE jobs ADD COLUMN owner TEXT")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS job_pages ("
+            "job_id TEXT NOT NULL, page INTEGER NOT NULL, result TEXT NOT NULL, "
+            "PRIMARY KEY (job_id, page))"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, created_at)")
+
+    # ------------------------------------------------------------
+    # Jobs
+    # ------------------------------------------------------------
+    def create(self, kind: str, params: dict) -> str:
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT INTO jobs (id, kind, status, params, created_at, updated_at) "
+                "VALUES (?, ?, 'queued', ?, ?, ?)",
+                (job_id, kind, json.dumps(params, ensure_ascii=False), now, now)
+            )
+        return job_id
+
+    def get(self, job_id: str) -> dict:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT id, kind, status, params, pages_total, pages_done, result, error, "
+                "created_at, updated_at FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+        if row is None:
+            return None
+
+        keys = ("id", "kind", "status", "params", "pages_total", "pages_done",
+                "result", "error", "created_at", "updated_at")
+        job = dict(zip(keys, row))
+        job["params"] = json.loads(job["params"])
+        job["result"] = json.loads(job["result"]) if job["result"] else None
+        return job
+
+    def claim(self) -> dict:
+        """
+        Atomically take the oldest queued (or lease-expired) job, or None.
+        The returned job carries the new lease's "owner" token.
+        """
+        now = time.time()
+        owner = uuid.uuid4().hex
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._db.execute(
+                    "SELECT id FROM jobs WHERE status = 'queued' "
+                    "OR (status = 'running' AND heartbeat_at < ?) "
+                    "ORDER BY created_at LIMIT 1", (now - self.lease_seconds,)
+                ).fetchone()
+                if row is not None:
+                    self._db.execute(
+                        "UPDATE jobs SET status = 'running', owner = ?, heartbeat_at = ?, "
+                        "updated_at = ? WHERE id = ?", (owner, now, now, row[0])
+                    )
+                self._db.execute("COMMIT")
+            except Exception:
+                self._db.execute("ROLLBACK")
+                raise
+
+        if row is None:
+            return None
+        job = self.get(row[0])
+        job["owner"] = owner
+        return job
+
+    def heartbeat(self, job_id: str, owner: str) -> bool:
+        """Renew a lease; False once the job is cancelled or owned by another claim."""
+        now = time.time()
+        with self._lock:
+            cur = self._db.execute(
+                "UPDATE jobs SET heartbeat_at = ? "
+                "WHERE id = ? AND owner = ? AND status = 'running'",
+                (now, job_id, owner)
+            )
+        return cur.rowcount > 0
+
+    def set_total(self, job_id: str, pages_total: int):
+        with self._lock:
+            self._db.execute(
+                "UPDATE jobs SET pages_total = ?, updated_at = ? WHERE id = ?",
+                (pages_total, time.time(), job_id)
+            )
+
+    def checkpoint(self, job_id: str, page: int, result: dict, owner: str):
+        """
+        Store one finished page and renew the job's lease. Raises
+        JobCancelled or JobLeaseLost (and stores nothing) when `owner` no
+        longer runs the job.
+        """
+        now = time.time()
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._db.execute(
+                    "SELECT status, owner FROM jobs WHERE id = ?", (job_id,)
+                ).fetchone()
+                if row is None or row[0] == "cancelled":
+                    raise JobCancelled(job_id)
+                if row[0] != "running" or row[1] != owner:
+                    raise JobLeaseLost(job_id)
+
+                self._db.execute(
+                    "INSERT OR REPLACE INTO job_pages (job_id, page, result) VALUES (?, ?, ?)",
+                    (job_id, page, json.dumps(result, ensure_ascii=False))
+                )
+                self._db.execute(
+                    "UPDATE jobs SET pages_done = "
+                    "(SELECT COUNT(*) FROM job_pages WHERE job_id = ?), "
+                    "heartbeat_at = ?, updated_at = ? WHERE id = ?",
+                    (job_id, now, now, job_id)
+                )
+                self._db.execute("COMMIT")
+            except Exception:
+                self._db.execute("ROLLBACK")
+                raise
+
+    def pages(self, job_id: str) -> list:
+        """Checkpointed page results, in page order."""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT result FROM job_pages WHERE job_id = ? ORDER BY page", (job_id,)
+            ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def finish(self, job_id: str, status: str, owner: str, result: dict = None, error: str = None):
+        # Only the current owner of a running job can finish it: a cancelled
+        # job stays cancelled, and a reclaimed one is finished by its new owner
+        with self._lock:
+            self._db.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = ?, updated_at = ? "
+                "WHERE id = ? AND owner = ? AND status = 'running'",
+                (status, json.dumps(result, ensure_ascii=False) if result is not None else None,
+                 error, time.time(), job_id, owner)
+            )
+
+    def cancel(self, job_id: str) -> str:
+        """
+        Cancel a job that has not finished. Returns the status it was
+        cancelled from ("queued" or "running"), or None if there was
+        nothing to cancel; read and update are one transaction, so a
+        "queued" job was never claimed by any worker.
+        """
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._db.execute(
+                    "SELECT status FROM jobs WHERE id = ?", (job_id,)
+                ).fetchone()
+                previous = row[0] if row and row[0] in ("queued", "running") else None
+                if previous is not None:
+                    self._db.execute(
+                        "UPDATE jobs SET status = 'cancelled', updated_at = ? WHERE id = ?",
+                        (time.time(), job_id)
+                    )
+                self._db.execute("COMMIT")
+            except Exception:
+                self._db.execute("ROLLBACK")
+                raise
+        return previous
+
+    def status(self, job_id: str) -> str:
+        with self._lock:
+            row = self._db.execute("SELECT status FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return row[0] if row else None
+
+    def counts(self) -> dict:
+        with self._lock:
+            rows = self._db.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        return {status: dict(rows).get(status, 0) for status in JOB_STATUSES}
+
+
+class JobQueue:
+    """
+    Worker threads that run stored jobs through per-kind handlers.
+
+    A handler is called as handler(job, ctx) where ctx offers:
+    - ctx.done_pages: pages already checkpointed (resume after these)
+    - ctx.set_total(n)
+    - ctx.checkpoint(page, result): store a page; raises JobCancelled
+      when the job was cancelled meanwhile, or JobLeaseLost when another
+      worker reclaimed it
+    and returns the final result dict.
+    """
+
+    def __init__(self, store: JobStore, handlers: dict, workers: int = 2, poll_seconds: float = 1.0):
+        self.store = store
+        self.handlers = handlers
+        self.poll_seconds = poll_seconds
+
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._threads = [
+            threading.Thread(target=self._run, name=f"aksara-job-{i}", daemon=True)
+            for i in range(max(0, workers))
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(self, kind: str, params: dict) -> str:
+        if kind not in self.handlers:
+            raise ValueError(f"Unknown job kind '{kind}', expected one of {list(self.handlers)}.")
+        job_id = self.store.create(kind, params)
+        self._wake.set()
+        return job_id
+
+    def _run(self):
+        while not self._stop.is_set():
+            job = self.store.claim()
+            if job is None:
+                self._wake.wait(self.poll_seconds)
+                self._wake.clear()
+                continue
+            self._execute(job)
+
+    def _execute(self, job: dict):
+        ctx = _JobContext(self.store, job["id"], job["owner"])
+
+        # Keep the lease alive while the handler runs, however long a
+        # single page takes (e.g. translation retries with backoff)
+        stop = threading.Event()
+        heartbeat = threading.Thread(
+            target=self._heartbeat, args=(ctx, stop), name="aksara-job-heartbeat", daemon=True
+        )
+        heartbeat.start()
+        try:
+            result = self.handlers[job["kind"]](job, ctx)
+        except (JobCancelled, JobLeaseLost):
+            return
+        except Exception as e:
+            self.store.finish(job["id"], "failed", job["owner"], error=str(e))
+            return
+        finally:
+            stop.set()
+            heartbeat.join()
+        self.store.finish(job["id"], "done", job["owner"], result=result)
+
+    def _heartbeat(self, ctx, stop: threading.Event):
+        interval = max(0.01, self.store.lease_seconds / 3)
+        while not stop.wait(interval):
+            if not self.store.heartbeat(ctx.job_id, ctx.owner):
+                # Cancelled or reclaimed; the next checkpoint stops the handler
+                return
+
+    def shutdown(self):
+        self._stop.set()
+        self._wake.set()
+        for thread in self._threads:
+            thread.join(timeout=5)
+
+
+class _JobContext:
+
+    def __init__(self, store: JobStore, job_id: str, owner: str):
+        self.store = store
+        self.job_id = job_id
+        self.owner = owner
+        self.done_pages = len(store.pages(job_id))
+
+    def set_total(self, pages_total: int):
+        self.store.set_total(self.job_id, pages_total)
+
+    def cancelled(self) -> bool:
+        return self.store.status(self.job_id) == "cancelled"
+
+    def checkpoint(self, page: int, result: dict):
+        self.store.checkpoint(self.job_id, page, result, self.owner)
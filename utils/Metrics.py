@@ -0,0 +1,200 @@
+import time
+import bisect
+import threading
+import contextvars
+from contextlib import contextmanager
+
+
+# ------------------------------------------------------------
+# Metric types
+# ------------------------------------------------------------
+# Small, dependency-free counterparts of the Prometheus client types: a
+# lock and a few additions per observation, cheap enough to leave on.
+
+DEFAULT_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0
+)
+
+
+def _label_str(names, values) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{n}="{v}"' for n, v in zip(names, values))
+    return "{" + pairs + "}"
+
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, labels: tuple = ()):
+        self.name = name
+        self.help = help_text
+        self.labels = tuple(labels)
+        self._lock = threading.Lock()
+        self._values = {}
+
+    def inc(self, *label_values, amount: float = 1.0):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0.0) + amount
+
+    def samples(self):
+        with self._lock:
+            return [
+                (self.name, _label_str(self.labels, key), value)
+                for key, value in sorted(self._values.items())
+            ]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def set(self, *label_values, value: float):
+        with self._lock:
+            self._values[label_values] = value
+
+    def dec(self, *label_values, amount: float = 1.0):
+        self.inc(*label_values, amount=-amount)
+
+
+class Histogram:
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, labels: tuple = (), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.labels = tuple(labels)
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        self._values = {}   # label values -> [bucket counts..., +Inf count, sum]
+
+    def observe(self, *label_values, value: float):
+        i = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            row = self._values.get(label_values)
+            if row is None:
+                row = self._values[label_values] = [0] * (len(self.buckets) + 1) + [0.0]
+            row[i] += 1
+            row[-1] += value
+
+    def samples(self):
+        with self._lock:
+            rows = sorted((key, list(row)) for key, row in self._values.items())
+
+        out = []
+        for key, row in rows:
+            cumulative = 0
+            for bound, count in zip(self.buckets + ("+Inf",), row[:-1]):
+                cumulative += count
+                labels = _label_str(self.labels + ("le",), key + (bound,))
+                out.append((self.name + "_bucket", labels, cumulative))
+            labels = _label_str(self.labels, key)
+            out.append((self.name + "_count", labels, cumulative))
+            out.append((self.name + "_sum", labels, row[-1]))
+        return out
+
+
+# ------------------------------------------------------------
+# Registry
+# ------------------------------------------------------------
+class MetricsRegistry:
+    """
+    Holds metrics and renders them in the Prometheus text format.
+
+    Collectors are callables run at scrape time that return
+    (name, help, kind, [(labels dict, value)]) tuples, for values that
+    already live elsewhere (cache stats, executor queue depth).
+    """
+
+    def __init__(self):
+        self._metrics = []
+        self._collectors = []
+
+    def counter(self, name, help_text, labels=()) -> Counter:
+        return self._add(Counter(name, help_text, labels))
+
+    def gauge(self, name, help_text, labels=()) -> Gauge:
+        return self._add(Gauge(name, help_text, labels))
+
+    def histogram(self, name, help_text, labels=(), buckets=DEFAULT_BUCKETS) -> Histogram:
+        return self._add(Histogram(name, help_text, labels, buckets))
+
+    def _add(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def add_collector(self, fn):
+        self._collectors.append(fn)
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for name, labels, value in metric.samples():
+                lines.append(f"{name}{labels} {value}")
+
+        for collector in self._collectors:
+            for name, help_text, kind, samples in collector():
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {kind}")
+                for labels, value in samples:
+                    label_str = _label_str(tuple(labels), tuple(labels.values()))
+                    lines.append(f"{name}{label_str} {value}")
+
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+STAGE_SECONDS = REGISTRY.histogram(
+    "aksara_stage_seconds",
+    "Time spent per pipeline stage.",
+    labels=("stage",),
+)
+INFERENCE_BATCH_SIZE = REGISTRY.histogram(
+    "aksara_inference_batch_size",
+    "Crops per ONNX session.run call.",
+    labels=("bucket",),
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128),
+)
+REQUEST_SECONDS = REGISTRY.histogram(
+    "aksara_request_seconds",
+    "End-to-end request latency per endpoint.",
+    labels=("endpoint", "status"),
+)
+REQUESTS_IN_FLIGHT = REGISTRY.gauge(
+    "aksara_requests_in_flight",
+    "HTTP requests currently being handled.",
+)
+
+
+# ------------------------------------------------------------
+# Per-request timing breakdown
+# ------------------------------------------------------------
+# A request that asked for timings sets a dict in this context variable;
+# every stage() on the same logical call path (including executor threads,
+# see InferenceExecutor.run) adds its duration to it.
+_trace = contextvars.ContextVar("aksara_trace", default=None)
+
+
+def start_trace() -> dict:
+    timings = {}
+    _trace.set(timings)
+    return timings
+
+
+def observe_stage(name: str, seconds: float):
+    STAGE_SECONDS.observe(name, value=seconds)
+    timings = _trace.get()
+    if timings is not None:
+        timings[name] = timings.get(name, 0.0) + seconds
+
+
+@contextmanager
+def stage(name: str):
+    """Time a block as pipeline stage `name`."""
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe_stage(name, time.perf_counter() - t0)
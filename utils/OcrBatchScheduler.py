@@ -0,0 +1,191 @@
+import time
+import queue
+import threading
+from concurrent.futures import Future
+
+
+class OcrBatchScheduler:
+    """
+    Dynamic micro-batching in front of OcrAksaraLontara.
+
+    Crops submitted from many in-flight requests are collected for up to
+    max_latency_ms or max_batch_size items, then recognized together with
+    one ocr_aksara_batch call. Every caller gets back only its own results.
+
+    Exposes the same ocr_aksara_batch / ocr_aksara_from_image methods as
+    the recognizer, so it can be used in its place.
+    """
+
+    def __init__(self, ocr, max_batch_size: int = 32, max_latency_ms: float = 5.0):
+        self.ocr = ocr
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_latency = max(0.0, max_latency_ms) / 1000.0
+
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._closed = False
+
+        # Metrics
+        self.batches = 0
+        self.items = 0
+        self.max_seen = 0
+        self.size_histogram = {}   # upper bound (power of two) -> count
+
+        self._worker = threading.Thread(
+            target=self._run, name="aksara-ocr-batcher", daemon=True
+        )
+        self._worker.start()
+
+    # ------------------------------------------------------------
+    # Submit
+    # ------------------------------------------------------------
+    def submit(self, image, pad_to_buckets: bool = None) -> Future:
+        """Queue one crop; the future resolves to {"text", "confidence", "char_confidences"}."""
+        if self._closed:
+            raise RuntimeError("OcrBatchScheduler is closed.")
+
+        # Decoded here, in the caller's thread: a bad input (missing file,
+        # unsupported type) fails only its own caller, never the batch
+        image = self.ocr.load_image(image)
+
+        future = Future()
+        # Checked again under the lock, so nothing is queued behind close()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("OcrBatchScheduler is closed.")
+            self._queue.put((image, future, pad_to_buckets))
+        return future
+
+    def ocr_aksara_batch(self, images, return_confidence: bool = False, pad_to_buckets: bool = None):
+        futures = [self.submit(image, pad_to_buckets) for image in images]
+        results = [future.result() for future in futures]
+
+        if return_confidence:
+            return results
+        return [res["text"] for res in results]
+
+    def ocr_aksara_from_image(self, image_input):
+        # Single-image recognition stays exact-width, so it is not batched
+        return self.ocr.ocr_aksara_from_image(image_input)
+
+    # ------------------------------------------------------------
+    # Worker
+    # ------------------------------------------------------------
+    def _collect(self):
+        """Block for the first item, then gather more until size or deadline."""
+        first = self._queue.get()
+        if first is None:
+            return None
+
+        batch = [first]
+        deadline = time.monotonic() + self.max_latency
+
+        while len(batch) < self.max_batch_size:
+            timeout = deadline - time.monotonic()
+            try:
+                item = self._queue.get(timeout=timeout) if timeout > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                # Close requested: finish this batch, then stop
+                self._queue.put(None)
+                break
+            batch.append(item)
+
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            if batch is None:
+                return
+
+            # Skip callers that gave up (cancelled) before we started
+            batch = [item for item in batch if item[1].set_running_or_notify_cancel()]
+            if not batch:
+                continue
+
+            # Crops that asked for a different padding mode run separately
+            groups = {}
+            for item in batch:
+                groups.setdefault(item[2], []).append(item)
+
+            for pad_to_buckets, items in groups.items():
+                try:
+                    results = self.ocr.ocr_aksara_batch(
+                        [image for image, _, _ in items],
+                        return_confidence=True,
+                        pad_to_buckets=pad_to_buckets
+                    )
+                except Exception:
+                    # Find the culprit: rerun one by one so each caller gets
+                    # its own result or its own error
+                    self._run_single(items)
+                    continue
+
+                for (_, future, _), res in zip(items, results):
+                    future.set_result(res)
+
+            self._record(len(batch))
+
+    def _run_single(self, batch):
+        for image, future, pad_to_buckets in batch:
+            try:
+                res = self.ocr.ocr_aksara_batch(
+                    [image], return_confidence=True, pad_to_buckets=pad_to_buckets
+                )[0]
+            except Exception as e:
+                future.set_exception(e)
+            else:
+                future.set_result(res)
+
+    def _record(self, size: int):
+        bound = 1
+        while bound < size:
+            bound *= 2
+
+        with self._lock:
+            self.batches += 1
+            self.items += size
+            self.max_seen = max(self.max_seen, size)
+            self.size_histogram[bound] = self.size_histogram.get(bound, 0) + 1
+
+    # ------------------------------------------------------------
+    # Stats / lifecycle
+    # ------------------------------------------------------------
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "batches": self.batches,
+                "items": self.items,
+                "mean_batch_size": self.items / self.batches if self.batches else 0.0,
+                "max_batch_size_seen": self.max_seen,
+                "batch_size_histogram": dict(sorted(self.size_histogram.items())),
+                "queued": self._queue.qsize(),
+                "max_batch_size": self.max_batch_size,
+                "max_latency_ms": self.max_latency * 1000.0,
+            }
+
+    def close(self):
+        """
+        Stop the worker. Crops queued before close() are still recognized
+        if the worker gets to them within the join timeout; every other
+        pending caller gets a RuntimeError instead of waiting forever.
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(None)
+        self._worker.join(timeout=5)
+
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not None and item[1].set_running_or_notify_cancel():
+                item[1].set_exception(RuntimeError("OcrBatchScheduler is closed."))
+
+        # The worker may still be finishing a batch; let it stop afterwards
+        self._queue.put(None)
@@ -0,0 +1,112 @@
+import sys
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+
+class OcrResultCache:
+    """
+    LRU cache of OCR results keyed on decoded pixels + preprocessing params.
+
+    The budget is in bytes (keys + values), not entries, so a burst of
+    long page texts cannot grow the cache without bound.
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+
+        self._items = OrderedDict()   # key -> (value, size)
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    # ------------------------------------------------------------
+    # Keys
+    # ------------------------------------------------------------
+    @staticmethod
+    def make_key(pixels: np.ndarray, **params) -> str:
+        """
+        Hash the pixel buffer together with its shape/dtype and any
+        parameters that change the OCR output (img_height, max_width,
+        model hash, detector, ...).
+        """
+        h = hashlib.blake2b(digest_size=20)
+        h.update(repr((pixels.shape, pixels.dtype.str, sorted(params.items()))).encode())
+        h.update(np.ascontiguousarray(pixels).data)
+        return h.hexdigest()
+
+    @staticmethod
+    def file_hash(path: str, chunk_size: int = 1024 * 1024) -> str:
+        """sha256 of a file, read in chunks (used for model files)."""
+        h = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(chunk_size), b""):
+                h.update(chunk)
+        return h.hexdigest()
+
+    @classmethod
+    def _sizeof(cls, value) -> int:
+        """Approximate deep size of cached values (str, numbers, lists, dicts)."""
+        size = sys.getsizeof(value)
+        if isinstance(value, dict):
+            size += sum(cls._sizeof(k) + cls._sizeof(v) for k, v in value.items())
+        elif isinstance(value, (list, tuple)):
+            size += sum(cls._sizeof(v) for v in value)
+        return size
+
+    # ------------------------------------------------------------
+    # Get / Set
+    # ------------------------------------------------------------
+    def get(self, key: str):
+        with self._lock:
+            entry = self._items.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self._items.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def set(self, key: str, value):
+        size = sys.getsizeof(key) + self._sizeof(value)
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self.current_bytes -= old[1]
+
+            self._items[key] = (value, size)
+            self.current_bytes += size
+
+            while self.current_bytes > self.max_bytes:
+                _, (_, evicted_size) = self._items.popitem(last=False)
+                self.current_bytes -= evicted_size
+                self.evictions += 1
+
+    # ------------------------------------------------------------
+    # Stats
+    # ------------------------------------------------------------
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / total if total else 0.0,
+            "items": len(self._items),
+            "bytes": self.current_bytes,
+            "max_bytes": self.max_bytes,
+        }
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self.current_bytes = 0
@@ -0,0 +1,190 @@
+import os
+import threading
+from collections import deque
+from multiprocessing import shared_memory, resource_tracker
+
+import numpy as np
+
+
+# ------------------------------------------------------------
+# Page rendering helpers
+# ------------------------------------------------------------
+# Module-level functions so they can be sent to a ProcessPoolExecutor.
+# pypdfium2 is imported inside them, so only processes that actually
+# render pay for it.
+#
+# PDFium is not thread-safe at all, not even across separate documents:
+# every pdfium call in a process (open, page sizes, render, close) must
+# hold PDFIUM_LOCK. Worker processes each have their own copy of it.
+PDFIUM_LOCK = threading.RLock()
+
+
+def page_sizes(pdf_path: str) -> list:
+    """(width, height) in PDF points for every page."""
+    if not os.path.exists(pdf_path):
+        raise FileNotFoundError(f"PDF not found: {pdf_path}")
+
+    import pypdfium2 as pdfium
+    with PDFIUM_LOCK:
+        pdf = pdfium.PdfDocument(pdf_path)
+        try:
+            return [pdf.get_page_size(i) for i in range(len(pdf))]
+        finally:
+            pdf.close()
+
+
+def render_bitmap(page, scale: float = 2):
+    """
+    Render a page straight to an RGB bitmap (hold PDFIUM_LOCK).
+
+    bitmap.to_numpy() is a HWC uint8 view over pdfium's buffer (no PIL,
+    no PNG round trip). The view is only valid while the bitmap object
+    is alive, so callers keep a reference to the bitmap while they use it.
+    """
+    return page.render(scale=scale, rev_byteorder=True)
+
+
+def render_range_to_shm(pdf_path: str, start: int, stop: int, scale: float = 2) -> list:
+    """
+    Render pages [start, stop) into one shared memory block per page.
+
+    Returns:
+    - list of (page_index, shm_name, shape); the caller attaches to and
+      unlinks every block
+    """
+    import pypdfium2 as pdfium
+
+    pages = []
+    with PDFIUM_LOCK:
+        pdf = pdfium.PdfDocument(pdf_path)
+        try:
+            for i in range(start, stop):
+                page = pdf[i]
+                bitmap = render_bitmap(page, scale)
+                arr = bitmap.to_numpy()
+
+                shm = shared_memory.SharedMemory(create=True, size=max(1, arr.nbytes))
+                np.ndarray(arr.shape, dtype=np.uint8, buffer=shm.buf)[...] = arr
+                pages.append((i, shm.name, arr.shape))
+
+                # Ownership moves to the parent, which unlinks the block; stop
+                # this worker's resource tracker from unlinking it at exit
+                resource_tracker.unregister(shm._name, "shared_memory")
+                shm.close()
+                bitmap.close()
+                page.close()
+        except Exception:
+            _unlink_pages(pages)
+            raise
+        finally:
+            pdf.close()
+
+    return pages
+
+
+def _unlink_pages(pages):
+    for _, name, _ in pages:
+        try:
+            shm = shared_memory.SharedMemory(name=name)
+            shm.close()
+            shm.unlink()
+        except FileNotFoundError:
+            pass
+
+
+# ------------------------------------------------------------
+# Parallel rasterizer
+# ------------------------------------------------------------
+class PdfRasterizer:
+    """
+    Render PDF pages on a process pool and hand them back in page order.
+
+    Each task opens the PDF on its own and renders a range of pages into
+    shared memory, so pixels reach the API process without pickling.
+    The estimated bytes of pages in flight are kept under max_memory_bytes.
+    No pdfium call is made in the calling process.
+    """
+
+    def __init__(
+        self,
+        pool,
+        pages_per_task: int = 4,
+        max_memory_bytes: int = 512 * 1024 * 1024,
+    ):
+        self.pool = pool
+        self.pages_per_task = max(1, pages_per_task)
+        self.max_memory_bytes = max_memory_bytes
+
+    @staticmethod
+    def _range_bytes(sizes, start: int, stop: int, scale: float) -> int:
+        return sum(
+            int(round(w * scale)) * int(round(h * scale)) * 3
+            for w, h in sizes[start:stop]
+        )
+
+    def iter_page_batches(
+        self, pdf_path: str, scale: float = 2, window: int = None, start_page: int = 0
+    ):
+        """
+        Yield lists of (page_index, RGB HWC uint8 array), in page order.
+
+        Arrays are views over shared memory and are released when the
+        consumer asks for the next batch, so use (or copy) them first.
+        `window` caps the number of tasks in flight (default: pool size);
+        pages before start_page are not rendered.
+        """
+        sizes = self.pool.submit(page_sizes, pdf_path).result()
+        ranges = [
+            (start, min(start + self.pages_per_task, len(sizes)))
+            for start in range(start_page, len(sizes), self.pages_per_task)
+        ]
+        max_tasks = window or max(1, getattr(self.pool, "_max_workers", 2))
+
+        pending = deque()      # (future, estimated_bytes)
+        in_flight_bytes = 0
+        next_range = 0
+
+        try:
+            while next_range < len(ranges) or pending:
+                # Submit while under the task and memory caps (always allow one)
+                while next_range < len(ranges) and len(pending) < max_tasks:
+                    start, stop = ranges[next_range]
+                    estimate = self._range_bytes(sizes, start, stop, scale)
+                    if pending and in_flight_bytes + estimate > self.max_memory_bytes:
+                        break
+
+                    future = self.pool.submit(render_range_to_shm, pdf_path, start, stop, scale)
+                    pending.append((future, estimate))
+                    in_flight_bytes += estimate
+                    next_range += 1
+
+                future, estimate = pending.popleft()
+                pages = future.result()
+
+                blocks = []
+                try:
+                    batch = []
+                    for index, name, shape in pages:
+                        shm = shared_memory.SharedMemory(name=name)
+                        blocks.append(shm)
+                        batch.append((index, np.ndarray(shape, dtype=np.uint8, buffer=shm.buf)))
+
+                    yield batch
+                    del batch
+
+                finally:
+                    for shm in blocks:
+                        shm.unlink()
+                        try:
+                            shm.close()
+                        except BufferError:
+                            # A view is still alive; the mapping goes with it
+                            pass
+                    _unlink_pages(pages[len(blocks):])
+                    in_flight_bytes -= estimate
+
+        finally:
+            # Abandoned early: drop queued work and free finished blocks
+            for future, _ in pending:
+                if not future.cancel() and not future.exception():
+                    _unlink_pages(future.result())
@@ -0,0 +1,39 @@
+import threading
+
+
+class TokenUsage:
+    """
+    Running totals of Gemini token usage, read from response.usage_metadata.
+
+    cached_tokens is the part of the input served from the provider's
+    context cache (the static system instruction), so
+    cached_tokens / prompt_tokens is the measured input-token saving.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.prompt_tokens = 0
+        self.cached_tokens = 0
+        self.output_tokens = 0
+
+    def record(self, usage_metadata):
+        if usage_metadata is None:
+            return
+
+        with self._lock:
+            self.requests += 1
+            self.prompt_tokens += getattr(usage_metadata, "prompt_token_count", 0) or 0
+            self.cached_tokens += getattr(usage_metadata, "cached_content_token_count", 0) or 0
+            self.output_tokens += getattr(usage_metadata, "candidates_token_count", 0) or 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "prompt_tokens": self.prompt_tokens,
+                "cached_tokens": self.cached_tokens,
+                "uncached_prompt_tokens": self.prompt_tokens - self.cached_tokens,
+                "output_tokens": self.output_tokens,
+                "cached_ratio": self.cached_tokens / self.prompt_tokens if self.prompt_tokens else 0.0,
+            }
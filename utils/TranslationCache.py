@@ -0,0 +1,149 @@
+import re
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+import unicodedata
+from collections import OrderedDict
+
+
+class TranslationCache:
+    """
+    Content-addressed cache for translation results.
+
+    Keys are (normalized aksara text, model name, prompt version).
+    - memory tier: LRU with TTL
+    - disk tier (optional): SQLite file that survives restarts
+    """
+
+    def __init__(
+        self,
+        max_items: int = 1024,
+        ttl_seconds: float = 24 * 3600,
+        db_path: str = None,
+    ):
+        self.max_items = max_items
+        self.ttl_seconds = ttl_seconds
+        self.db_path = db_path
+
+        self._items = OrderedDict()   # key -> (expires_at, value)
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+
+        self._db = None
+        if db_path:
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS translations ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL)"
+            )
+            self._db.commit()
+
+    # ------------------------------------------------------------
+    # Keys
+    # ------------------------------------------------------------
+    @staticmethod
+    def normalize(text: str) -> str:
+        """NFC-normalize and collapse whitespace on every line."""
+        text = unicodedata.normalize("NFC", text or "")
+        lines = (re.sub(r"\s+", " ", line).strip() for line in text.splitlines())
+        return "\n".join(line for line in lines if line)
+
+    @classmethod
+    def make_key(cls, text: str, model_name: str, prompt_version: str) -> str:
+        raw = "\x1f".join([cls.normalize(text), model_name or "", str(prompt_version)])
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    # ------------------------------------------------------------
+    # Get / Set
+    # ------------------------------------------------------------
+    def _expires_at(self):
+        if self.ttl_seconds is None:
+            return None
+        return time.time() + self.ttl_seconds
+
+    @staticmethod
+    def _expired(expires_at) -> bool:
+        return expires_at is not None and expires_at < time.time()
+
+    def get(self, key: str):
+        with self._lock:
+            entry = self._items.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if not self._expired(expires_at):
+                    self._items.move_to_end(key)
+                    self.hits += 1
+                    return dict(value)
+                del self._items[key]
+
+            value = self._get_disk(key)
+            if value is not None:
+                self._set_memory(key, value, self._expires_at())
+                self.hits += 1
+                self.disk_hits += 1
+                return dict(value)
+
+            self.misses += 1
+            return None
+
+    def set(self, key: str, value: dict):
+        value = dict(value)
+        expires_at = self._expires_at()
+        with self._lock:
+            self._set_memory(key, value, expires_at)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO translations (key, value, expires_at) VALUES (?, ?, ?)",
+                    (key, json.dumps(value, ensure_ascii=False), expires_at)
+                )
+                self._db.commit()
+
+    def _set_memory(self, key, value, expires_at):
+        self._items[key] = (expires_at, value)
+        self._items.move_to_end(key)
+        while len(self._items) > self.max_items:
+            self._items.popitem(last=False)
+
+    def _get_disk(self, key):
+        if self._db is None:
+            return None
+
+        row = self._db.execute(
+            "SELECT value, expires_at FROM translations WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+
+        value, expires_at = row
+        if self._expired(expires_at):
+            self._db.execute("DELETE FROM translations WHERE key = ?", (key,))
+            self._db.commit()
+            return None
+
+        return json.loads(value)
+
+    # ------------------------------------------------------------
+    # Stats
+    # ------------------------------------------------------------
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "disk_hits": self.disk_hits,
+            "hit_rate": self.hits / total if total else 0.0,
+            "memory_items": len(self._items),
+            "disk_enabled": self._db is not None,
+        }
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM translations")
+                self._db.commit()
@@ -0,0 +1,209 @@
+import time
+import random
+import threading
+import unicodedata
+from concurrent.futures import ThreadPoolExecutor
+
+
+# HTTP status codes / gRPC names worth retrying: rate limits and overload
+RETRYABLE_CODES = {429, 500, 502, 503, 504}
+RETRYABLE_NAMES = {
+    "ResourceExhausted", "TooManyRequests", "ServiceUnavailable",
+    "InternalServerError", "DeadlineExceeded",
+}
+
+
+class TranslationScheduler:
+    """
+    Split long documents into token-budgeted segments and translate them
+    concurrently, reassembling the per-segment JSON in order.
+
+    - segments: whole lines packed greedily under max_segment_tokens
+    - concurrency: one shared, bounded pool for all requests
+    - retries: exponential backoff with jitter on rate limits / 5xx
+    """
+
+    def __init__(
+        self,
+        translate_fn,
+        max_segment_tokens: int = 1000,
+        max_concurrency: int = 4,
+        max_retries: int = 4,
+        base_delay: float = 1.0,
+        max_delay: float = 30.0,
+        chars_per_token: float = 1.0,
+    ):
+        self.translate_fn = translate_fn
+        self.max_segment_tokens = max(1, max_segment_tokens)
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.chars_per_token = chars_per_token
+
+        self.pool = ThreadPoolExecutor(
+            max_workers=max(1, max_concurrency),
+            thread_name_prefix="aksara-translate"
+        )
+
+        # Counters, updated from the pool's worker threads
+        self._lock = threading.Lock()
+        self.segments_sent = 0
+        self.retries = 0
+
+    # ------------------------------------------------------------
+    # Segmenting
+    # ------------------------------------------------------------
+    def estimate_tokens(self, text: str) -> int:
+        # Lontara code points are rarely merged by the tokenizer, so the
+        # default budget assumes about one token per character
+        return int(len(text) / self.chars_per_token) + 1
+
+    def split_segments(self, text: str) -> list:
+        """Pack lines into segments under the token budget; over-long lines are wrapped (see _wrap_line)."""
+        max_chars = max(1, int(self.max_segment_tokens * self.chars_per_token))
+        segments, current, current_tokens = [], [], 0
+
+        for line in text.splitlines():
+            line = line.strip()
+            if not line:
+                continue
+
+            for piece in self._wrap_line(line, max_chars):
+                tokens = self.estimate_tokens(piece)
+                if current and current_tokens + tokens > self.max_segment_tokens:
+                    segments.append("\n".join(current))
+                    current, current_tokens = [], 0
+                current.append(piece)
+                current_tokens += tokens
+
+        if current:
+            segments.append("\n".join(current))
+
+        return segments
+
+    @staticmethod
+    def _is_mark(char: str) -> bool:
+        # Lontara vowel signs (e.g. U+1A17-U+1A1B) are Mn/Mc combining marks
+        return unicodedata.category(char) in ("Mn", "Mc", "Me")
+
+    def _wrap_line(self, line: str, max_chars: int) -> list:
+        """
+        Hard-wrap a line into pieces of at most max_chars, preferring the
+        last space in range and never cutting a consonant from its vowel
+        sign. A cluster longer than max_chars is kept whole.
+        """
+        pieces = []
+        while len(line) > max_chars:
+            cut = line.rfind(" ", 1, max_chars + 1)
+            if cut > 0:
+                pieces.append(line[:cut])
+                line = line[cut + 1:].lstrip()
+                continue
+
+            cut = max_chars
+            while cut > 0 and self._is_mark(line[cut]):
+                cut -= 1
+            if cut == 0:
+                cut = max_chars
+                while cut < len(line) and self._is_mark(line[cut]):
+                    cut += 1
+            pieces.append(line[:cut])
+            line = line[cut:]
+
+        if line:
+            pieces.append(line)
+        return pieces
+
+    # ------------------------------------------------------------
+    # Retry
+    # ------------------------------------------------------------
+    @staticmethod
+    def _is_retryable(e: Exception) -> bool:
+        if type(e).__name__ in RETRYABLE_NAMES:
+            return True
+
+        code = getattr(e, "code", None)
+        code = getattr(code, "value", code)   # grpc.StatusCode / int
+        if isinstance(code, tuple):
+            code = code[0]
+        return code in RETRYABLE_CODES
+
+    def _with_retry(self, segment: str, *args):
+        attempt = 0
+        while True:
+            try:
+                with self._lock:
+                    self.segments_sent += 1
+                return self.translate_fn(segment, *args)
+            except Exception as e:
+                if attempt >= self.max_retries or not self._is_retryable(e):
+                    raise
+
+                delay = min(self.max_delay, self.base_delay * (2 ** attempt))
+                time.sleep(delay * random.uniform(0.5, 1.0))
+                attempt += 1
+                with self._lock:
+                    self.retries += 1
+
+    # ------------------------------------------------------------
+    # Translate
+    # ------------------------------------------------------------
+    def translate(self, text: str, *args) -> dict:
+        """
+        Translate a document of any length. Extra args are passed through
+        to translate_fn (e.g. the model name).
+
+        Returns:
+        - {"aksara", "latin", "indonesia"} with segment results joined by newlines
+        """
+        segments = self.split_segments(text)
+        if not segments:
+            return {"aksara": "", "latin": "", "indonesia": ""}
+
+        if len(segments) == 1:
+            return self._with_retry(segments[0], *args)
+
+        futures = [self.pool.submit(self._with_retry, seg, *args) for seg in segments]
+        return self._join([future.result() for future in futures])
+
+    def translate_many(self, texts: list, *args) -> list:
+        """
+        Translate several documents together: the segments of all of them
+        share the pool, and a segment that occurs more than once (in one
+        document or across documents) is sent only once.
+
+        Returns:
+        - one result per text, in order, as translate() would return it
+        """
+        doc_segments = [self.split_segments(text) for text in texts]
+
+        futures = {}
+        for segments in doc_segments:
+            for seg in segments:
+                if seg not in futures:
+                    futures[seg] = self.pool.submit(self._with_retry, seg, *args)
+
+        return [
+            self._join([futures[seg].result() for seg in segments])
+            for segments in doc_segments
+        ]
+
+    @staticmethod
+    def _join(results: list) -> dict:
+        """Reassemble per-segment results in order."""
+        if not results:
+            return {"aksara": "", "latin": "", "indonesia": ""}
+        if len(results) == 1:
+            return results[0]
+
+        return {
+            field: "\n".join(res.get(field, "") for res in results).strip()
+            for field in ("aksara", "latin", "indonesia")
+        }
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"segments_sent": self.segments_sent, "retries": self.retries}
+
+    def shutdown(self):
+        self.pool.shutdown(wait=False, cancel_futures=True)
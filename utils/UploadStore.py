@@ -0,0 +1,181 @@
+import os
+import json
+import hashlib
+import tempfile
+from io import BytesIO
+
+
+class UploadTooLargeError(ValueError):
+    """Raised when an upload passes the configured size limit."""
+
+    def __init__(self, max_bytes: int):
+        super().__init__(f"Upload exceeds the limit of {max_bytes} bytes.")
+        self.max_bytes = max_bytes
+
+
+class RequestSizeLimitMiddleware:
+    """
+    ASGI middleware that answers 413 for request bodies over a limit
+    before they are read.
+
+    Starlette spools a whole multipart body before the endpoint (and
+    UploadStore) sees the first byte, so UploadStore's own check comes
+    too late to save the disk and the bandwidth. This rejects a request by
+    its Content-Length up front, and one without it (chunked) as soon as
+    the bytes received pass the limit.
+
+    limits: {path prefix: max bytes}; the longest matching prefix wins,
+    default_max_bytes applies to every other path.
+    """
+
+    def __init__(self, app, default_max_bytes: int, limits: dict = None):
+        self.app = app
+        self.default_max_bytes = default_max_bytes
+        self.limits = sorted((limits or {}).items(), key=lambda kv: -len(kv[0]))
+
+    def max_bytes(self, path: str) -> int:
+        for prefix, max_bytes in self.limits:
+            if path.startswith(prefix):
+                return max_bytes
+        return self.default_max_bytes
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        max_bytes = self.max_bytes(scope["path"])
+        length = dict(scope["headers"]).get(b"content-length", b"")
+        if length.isdigit() and int(length) > max_bytes:
+            await self._reject(send, max_bytes)
+            return
+
+        received = 0
+        state = {"started": False, "rejected": False}
+
+        async def limited_receive():
+            nonlocal received
+            if state["rejected"]:
+                return {"type": "http.disconnect"}
+
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > max_bytes and not state["started"]:
+                    # Answer now and make the app see a disconnect
+                    state["rejected"] = True
+                    await self._reject(send, max_bytes)
+                    return {"type": "http.disconnect"}
+            return message
+
+        async def tracked_send(message):
+            if state["rejected"]:
+                return
+            if message["type"] == "http.response.start":
+                state["started"] = True
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, tracked_send)
+        except Exception:
+            # The app failing on the cut-off body; the 413 is already sent
+            if not state["rejected"]:
+                raise
+
+    @staticmethod
+    async def _reject(send, max_bytes: int):
+        body = json.dumps({"detail": str(UploadTooLargeError(max_bytes))}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 413,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"connection", b"close"),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+
+class UploadStore:
+    """
+    Chunked, size-limited handling of uploaded files.
+
+    - save():    stream to `directory` under a content-hash filename
+                 (identical uploads share one file, no name collisions)
+    - to_temp(): stream to a uniquely named temporary file the caller deletes
+    - read():    read into memory, for inputs that are never persisted
+    """
+
+    def __init__(self, directory: str, max_bytes: int, chunk_size: int = 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.chunk_size = chunk_size
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def _extension(filename: str) -> str:
+        ext = os.path.splitext(os.path.basename(filename or ""))[1].lower()
+        return ext if ext[1:].isalnum() and len(ext) <= 8 else ""
+
+    def _copy(self, src, dst) -> str:
+        """Copy src -> dst in chunks, enforcing max_bytes. Returns sha256 hex."""
+        h = hashlib.sha256()
+        size = 0
+
+        while True:
+            chunk = src.read(self.chunk_size)
+            if not chunk:
+                break
+
+            size += len(chunk)
+            if size > self.max_bytes:
+                raise UploadTooLargeError(self.max_bytes)
+
+            h.update(chunk)
+            dst.write(chunk)
+
+        return h.hexdigest()
+
+    def save(self, fileobj, filename: str) -> str:
+        """Persist an upload and return its path."""
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".part")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                digest = self._copy(fileobj, f)
+
+            save_path = os.path.join(self.directory, digest[:32] + self._extension(filename))
+            if os.path.exists(save_path):
+                # Same content was uploaded before, keep the existing copy
+                os.remove(tmp_path)
+            else:
+                os.replace(tmp_path, save_path)
+
+            return save_path
+
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def to_temp(self, fileobj, filename: str, directory: str = None) -> str:
+        """
+        Write an upload to a uniquely named temp file (in the system temp
+        dir unless `directory` is given); the caller removes it.
+        """
+        fd, tmp_path = tempfile.mkstemp(suffix=self._extension(filename), dir=directory)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                self._copy(fileobj, f)
+            return tmp_path
+
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+
+    def read(self, fileobj) -> BytesIO:
+        """Read an upload into memory (size-limited), rewound for reading."""
+        buf = BytesIO()
+        self._copy(fileobj, buf)
+        buf.seek(0)
+        return buf